@@ -153,6 +153,10 @@ def remove_pagination_state(callback_id: str) -> None:
         _pagination_cache.pop(callback_id, None)
 
 
+# (label, value) pairs for yes_no/confirm prompts; only callback_data varies per run
+_YES_NO_BUTTONS = (("✅ Yes", "y"), ("❌ No", "n"))
+
+
 def create_prompt_keyboard(
     run_id: int,
     options: list[str],
@@ -207,9 +211,12 @@ def create_prompt_keyboard(
 
     elif prompt_type in ("yes_no", "confirm"):
         # Yes/No buttons on same row
-        yes_btn = InlineKeyboardButton(text="✅ Yes", callback_data=f"prompt:{run_id}:y")
-        no_btn = InlineKeyboardButton(text="❌ No", callback_data=f"prompt:{run_id}:n")
-        buttons = [[yes_btn, no_btn]]
+        buttons = [
+            [
+                InlineKeyboardButton(text=label, callback_data=f"prompt:{run_id}:{value}")
+                for label, value in _YES_NO_BUTTONS
+            ]
+        ]
 
     else:  # "select" or fallback
         # Numbered options (weld implement menu, commit grouping, etc.)
@@ -379,6 +386,10 @@ async def handle_prompt_callback(callback: CallbackQuery) -> None:
         await callback.answer("Command no longer running", show_alert=True)
 
 
+# Translation table for basic Markdown mode: escapes * _ ` [
+_MARKDOWN_ESCAPE_TABLE = str.maketrans({char: "\\" + char for char in ("*", "_", "`", "[")})
+
+
 def _escape_markdown(text: str) -> str:
     """Escape Markdown special characters for safe message formatting.
 
@@ -388,10 +399,7 @@ def _escape_markdown(text: str) -> str:
     Returns:
         Text with Markdown special characters escaped
     """
-    # For basic Markdown mode, escape: * _ ` [
-    for char in ("*", "_", "`", "["):
-        text = text.replace(char, "\\" + char)
-    return text
+    return text.translate(_MARKDOWN_ESCAPE_TABLE)
 
 
 # Patterns for detecting output file paths in command output
@@ -1513,6 +1521,22 @@ async def cancel_command(
         await message.answer("Nothing to cancel. No active or pending runs.")
 
 
+# Translation table for _sanitize_command_args, applied in a single pass:
+# - Unicode dashes become "--" (Telegram and other apps often auto-convert
+#   -- to em-dash or similar)
+# - Null bytes and shell metacharacters that could enable injection are removed
+#   (allowed: alphanumeric, space, dash, underscore, dot, forward slash, quotes)
+_COMMAND_ARGS_TABLE = str.maketrans(
+    {
+        "\u2014": "--",  # Em dash
+        "\u2013": "--",  # En dash
+        "\u2212": "--",  # Minus sign
+        "\u2015": "--",  # Horizontal bar
+        **dict.fromkeys(";&|$`(){}<>\n\r\0"),
+    }
+)
+
+
 def _sanitize_command_args(args: str) -> str:
     """Sanitize command arguments to prevent shell injection.
 
@@ -1529,27 +1553,7 @@ def _sanitize_command_args(args: str) -> str:
     if not args:
         return ""
 
-    # Remove null bytes
-    args = args.replace("\0", "")
-
-    # Normalize Unicode dashes to regular hyphens
-    # Telegram and other apps often auto-convert -- to em-dash or similar
-    unicode_dashes = [
-        "\u2014",  # Em dash
-        "\u2013",  # En dash
-        "\u2212",  # Minus sign
-        "\u2015",  # Horizontal bar
-    ]
-    for dash in unicode_dashes:
-        args = args.replace(dash, "--")
-
-    # Remove shell metacharacters that could enable injection
-    # Allow: alphanumeric, space, dash, underscore, dot, forward slash, quotes
-    dangerous_chars = [";", "&", "|", "$", "`", "(", ")", "{", "}", "<", ">", "\n", "\r"]
-    for char in dangerous_chars:
-        args = args.replace(char, "")
-
-    return args.strip()
+    return args.translate(_COMMAND_ARGS_TABLE).strip()
 
 
 def _find_uploaded_file(uploads_dir: Path, sanitized_name: str) -> Path | None:
@@ -422,6 +422,18 @@ async def _validate_token(token: str) -> tuple[bool, str]:
         await bot.session.close()
 
 
+def _validate_token_blocking(token: str) -> tuple[bool, str]:
+    """Run _validate_token to completion from synchronous CLI code.
+
+    Args:
+        token: Telegram bot API token to validate.
+
+    Returns:
+        Tuple of (success, message), as returned by _validate_token.
+    """
+    return asyncio.run(_validate_token(token))
+
+
 @telegram_app.command()
 def whoami() -> None:
     """Show current bot identity and authentication status.
@@ -438,7 +450,7 @@ def whoami() -> None:
         raise typer.Exit(1)
 
     try:
-        success, message = asyncio.run(_validate_token(config.bot_token))
+        success, message = _validate_token_blocking(config.bot_token)
     except Exception as e:
         typer.echo("Status: Cannot connect", err=True)
         typer.echo(f"Config: {config_path}", err=True)
@@ -524,7 +536,7 @@ def doctor() -> None:
         typer.echo("  Status: configured")
         typer.echo("  Validating with Telegram API...")
         try:
-            success, message = asyncio.run(_validate_token(config.bot_token))
+            success, message = _validate_token_blocking(config.bot_token)
             if success:
                 typer.echo(f"  Bot: {message}")
             else:
@@ -648,7 +660,7 @@ def init(
     # Validate token with Telegram API
     typer.echo("Validating token...")
     try:
-        success, message = asyncio.run(_validate_token(token))
+        success, message = _validate_token_blocking(token)
     except Exception as e:
         typer.echo(f"Error: Could not connect to Telegram API: {e}", err=True)
         typer.echo("Check your network connection and try again.")
@@ -2,6 +2,7 @@
 
 import logging
 import tomllib
+from functools import cached_property
 from pathlib import Path
 
 import tomli_w
@@ -22,6 +23,15 @@ class TelegramProject(BaseModel):
         if not self.path.is_absolute():
             object.__setattr__(self, "path", self.path.resolve())
 
+    @cached_property
+    def resolved_path(self) -> Path:
+        """Project path with symlinks resolved, computed once per instance.
+
+        Path validation compares every candidate against the project roots,
+        so the root's own resolution is cached rather than redone per check.
+        """
+        return self.path.resolve()
+
 
 class TelegramAuth(BaseModel):
     """User authentication configuration for Telegram bot."""
@@ -1,5 +1,6 @@
 """File path validation for Telegram bot /fetch and /push commands."""
 
+import errno
 from pathlib import Path
 
 import pathspec
@@ -422,6 +423,10 @@ class PathNotFoundError(FilePathError):
     """Raised when path does not exist (for fetch operations)."""
 
 
+# errno values that mean "nothing there to fetch" (the same set Path.exists() swallows)
+_MISSING_PATH_ERRNOS = frozenset({errno.ENOENT, errno.ENOTDIR, errno.EBADF, errno.ELOOP})
+
+
 def _resolve_and_validate_base(
     path: str | Path,
     config: TelegramConfig,
@@ -451,37 +456,36 @@ def _resolve_and_validate_base(
     path = Path(path)
 
     # For must_exist=True (fetch), we need to resolve symlinks to check real location
-    # For must_exist=False (push), we resolve what exists and keep the rest
+    # For must_exist=False (push), we resolve what exists and normalize the rest
     if must_exist:
-        if not path.exists():
-            raise PathNotFoundError(f"Path does not exist: {path}")
-        # Resolve symlinks to get the real path for security check
-        resolved = path.resolve(strict=True)
-    else:
-        # For push: resolve parent if it exists, then append filename
-        # This handles the case where the file doesn't exist yet
+        # Resolve symlinks to get the real path for security check. Strict
+        # resolution already fails for missing paths, so no separate exists()
+        # walk is needed. Symlink loops raise RuntimeError before Python 3.13,
+        # and names with an embedded NUL byte raise ValueError.
         try:
-            # Try strict resolution first
             resolved = path.resolve(strict=True)
-        except (FileNotFoundError, OSError):
-            # File doesn't exist - resolve parent and append filename
-            parent = path.parent
-            if parent.exists():
-                resolved = parent.resolve(strict=True) / path.name
-            else:
-                # Neither file nor parent exists - use non-strict resolution
-                # but verify no symlink shenanigans in existing parts
-                resolved = path.resolve(strict=False)
+        except (RuntimeError, ValueError):
+            raise PathNotFoundError(f"Path does not exist: {path}") from None
+        except OSError as e:
+            if e.errno not in _MISSING_PATH_ERRNOS:
+                raise
+            raise PathNotFoundError(f"Path does not exist: {path}") from None
+    else:
+        # For push the file, and possibly some parents, may not exist yet.
+        # Non-strict resolution follows every symlink that does exist,
+        # including a dangling final component whose target would be created
+        # by the write, and normalizes the missing tail lexically.
+        try:
+            resolved = path.resolve(strict=False)
+        except ValueError:
+            # Embedded NUL byte: no file by that name can ever be written
+            raise PathNotAllowedError(f"Invalid path: {str(path)!r}") from None
 
     # Check if resolved path is within any registered project
     for project in config.projects:
-        project_root = project.path.resolve()
-        try:
-            resolved.relative_to(project_root)
+        project_root = project.resolved_path
+        if resolved.is_relative_to(project_root):
             return resolved, project_root
-        except ValueError:
-            # Not within this project, try next
-            continue
 
     # Path is not within any project
     project_paths = ", ".join(str(p.path) for p in config.projects)
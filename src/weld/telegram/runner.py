@@ -22,6 +22,11 @@ PROMPT_TIMEOUT = 300.0
 # Graceful shutdown timeout before SIGKILL
 GRACEFUL_SHUTDOWN_TIMEOUT = 5.0
 
+# Maximum bytes taken from a pipe per read. A read returns whatever is already
+# buffered, so output that piles up while the consumer is busy arrives as one
+# chunk instead of many small ones.
+READ_CHUNK_SIZE = 64 * 1024
+
 # Registry of active runs: run_id -> (Process, input_queue)
 _active_runs: dict[int, tuple[asyncio.subprocess.Process, asyncio.Queue[str]]] = {}
 
@@ -175,6 +180,8 @@ async def execute_run(
 
     proc: asyncio.subprocess.Process | None = None
     input_queue: asyncio.Queue[str] = asyncio.Queue()
+    # Pending stream reads: task -> stream it reads from
+    readers: dict[asyncio.Task[bytes], ChunkType] = {}
 
     try:
         proc = await asyncio.create_subprocess_exec(
@@ -189,93 +196,76 @@ async def execute_run(
         # Register process and input queue for interaction
         _active_runs[run_id] = (proc, input_queue)
 
-        # Track when streams are exhausted
-        stdout_done = False
-        stderr_done = False
         # Buffer for accumulating output to detect prompts
         output_buffer = ""
 
-        async def read_chunk(
-            stream: asyncio.StreamReader | None,
-            stream_type: ChunkType,
-        ) -> tuple[ChunkType, str] | None:
-            """Try to read a chunk from a stream, return None if EOF."""
-            if stream is None:
-                return None
-            try:
-                chunk = await asyncio.wait_for(stream.read(4096), timeout=0.1)
-                if not chunk:
-                    return None
-                return (stream_type, chunk.decode("utf-8", errors="replace"))
-            except TimeoutError:
-                return ("_timeout", "")  # type: ignore[return-value]
+        # Keep one outstanding read per stream and wake only when one of them
+        # completes, re-arming just the stream that produced data.
+        streams: dict[ChunkType, asyncio.StreamReader] = {}
+        if proc.stdout:
+            streams["stdout"] = proc.stdout
+        if proc.stderr:
+            streams["stderr"] = proc.stderr
+        for stream_type, stream in streams.items():
+            readers[asyncio.create_task(stream.read(READ_CHUNK_SIZE))] = stream_type
 
-        start_time = asyncio.get_event_loop().time()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
 
-        while not (stdout_done and stderr_done):
+        while readers:
             # Check overall timeout
-            elapsed = asyncio.get_event_loop().time() - start_time
-            if elapsed >= timeout:
+            remaining = deadline - loop.time()
+            done: set[asyncio.Task[bytes]] = set()
+            if remaining > 0:
+                done, _ = await asyncio.wait(
+                    readers, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+            if not done:
                 logger.error(f"Run {run_id}: Command timed out after {timeout} seconds")
                 raise TimeoutError(f"Command timed out after {timeout} seconds")
 
-            # Try to read from stdout
-            if not stdout_done and proc.stdout:
-                result = await read_chunk(proc.stdout, "stdout")
-                if result is None:
-                    stdout_done = True
-                elif result[0] != "_timeout":
-                    _chunk_type, data = result
-                    output_buffer += data
-
-                    # Check for prompt
-                    prompt_info = detect_prompt(output_buffer)
-                    if prompt_info:
-                        logger.info(f"Run {run_id}: Detected prompt: {prompt_info.options}")
-                        yield ("prompt", output_buffer)
-                        output_buffer = ""
-
-                        # Wait for user input with dedicated prompt timeout (5 minutes)
-                        # This is separate from command timeout - prompts always get full time
-                        try:
-                            response = await asyncio.wait_for(
-                                input_queue.get(), timeout=PROMPT_TIMEOUT
-                            )
-                            logger.info(f"Run {run_id}: Received input: {response}")
-                            if proc.stdin:
-                                proc.stdin.write(f"{response}\n".encode())
-                                await proc.stdin.drain()
-                        except TimeoutError:
-                            logger.error(
-                                f"Run {run_id}: Prompt response timeout after "
-                                f"{PROMPT_TIMEOUT} seconds, cancelling run"
-                            )
-                            raise TimeoutError(
-                                f"Prompt not answered within {int(PROMPT_TIMEOUT // 60)} minutes"
-                            ) from None
-                    else:
-                        yield result
-
-            # Try to read from stderr
-            if not stderr_done and proc.stderr:
-                result = await read_chunk(proc.stderr, "stderr")
-                if result is None:
-                    stderr_done = True
-                elif result[0] != "_timeout":
-                    yield result
-
-            # If process exited, drain remaining output
-            if proc.returncode is not None:
-                if proc.stdout and not stdout_done:
-                    remaining = await proc.stdout.read()
-                    if remaining:
-                        yield ("stdout", remaining.decode("utf-8", errors="replace"))
-                    stdout_done = True
-                if proc.stderr and not stderr_done:
-                    remaining = await proc.stderr.read()
-                    if remaining:
-                        yield ("stderr", remaining.decode("utf-8", errors="replace"))
-                    stderr_done = True
+            # Handle stdout before stderr when both are ready
+            for task in sorted(done, key=lambda t: readers[t] != "stdout"):
+                stream_type = readers.pop(task)
+                chunk = task.result()
+                if not chunk:
+                    continue  # EOF, stop reading this stream
+                next_read = asyncio.create_task(streams[stream_type].read(READ_CHUNK_SIZE))
+                readers[next_read] = stream_type
+                data = chunk.decode("utf-8", errors="replace")
+
+                if stream_type != "stdout":
+                    yield (stream_type, data)
+                    continue
+
+                output_buffer += data
+
+                # Check for prompt
+                prompt_info = detect_prompt(output_buffer)
+                if not prompt_info:
+                    yield ("stdout", data)
+                    continue
+
+                logger.info(f"Run {run_id}: Detected prompt: {prompt_info.options}")
+                yield ("prompt", output_buffer)
+                output_buffer = ""
+
+                # Wait for user input with dedicated prompt timeout (5 minutes)
+                # This is separate from command timeout - prompts always get full time
+                try:
+                    response = await asyncio.wait_for(input_queue.get(), timeout=PROMPT_TIMEOUT)
+                    logger.info(f"Run {run_id}: Received input: {response}")
+                    if proc.stdin:
+                        proc.stdin.write(f"{response}\n".encode())
+                        await proc.stdin.drain()
+                except TimeoutError:
+                    logger.error(
+                        f"Run {run_id}: Prompt response timeout after "
+                        f"{PROMPT_TIMEOUT} seconds, cancelling run"
+                    )
+                    raise TimeoutError(
+                        f"Prompt not answered within {int(PROMPT_TIMEOUT // 60)} minutes"
+                    ) from None
 
         # Wait for process to complete
         try:
@@ -336,7 +326,9 @@ async def execute_run(
         raise TelegramRunError(f"Run {run_id}: {e}") from e
 
     finally:
-        # Always unregister the run
+        # Never leave a read pending on the pipes, then unregister the run
+        for task in readers:
+            task.cancel()
         _active_runs.pop(run_id, None)
 
 
@@ -440,7 +432,8 @@ async def cancel_run(run_id: int) -> bool:
     proc.terminate()
 
     try:
-        await asyncio.wait_for(proc.wait(), timeout=GRACEFUL_SHUTDOWN_TIMEOUT)
+        async with asyncio.timeout(GRACEFUL_SHUTDOWN_TIMEOUT):
+            await proc.wait()
         logger.info(f"Run {run_id}: Process terminated gracefully")
     except TimeoutError:
         logger.warning(
@@ -16,7 +16,7 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 # Schema version for migrations
-SCHEMA_VERSION = 1
+SCHEMA_VERSION = 2
 
 # Valid status values for type safety
 ConversationState = Literal["idle", "awaiting_project", "awaiting_command", "running"]
@@ -60,9 +60,14 @@ CREATE TABLE IF NOT EXISTS runs (
     FOREIGN KEY (project_name) REFERENCES projects(name)
 );
 
-CREATE INDEX IF NOT EXISTS idx_runs_user_id ON runs(user_id);
-CREATE INDEX IF NOT EXISTS idx_runs_project_name ON runs(project_name);
+-- Composite indexes serve the "most recent runs" listings without a sort
+CREATE INDEX IF NOT EXISTS idx_runs_user_started ON runs(user_id, started_at);
+CREATE INDEX IF NOT EXISTS idx_runs_project_started ON runs(project_name, started_at);
 CREATE INDEX IF NOT EXISTS idx_runs_status ON runs(status);
+
+-- v1 single-column indexes, superseded by the composites above
+DROP INDEX IF EXISTS idx_runs_user_id;
+DROP INDEX IF EXISTS idx_runs_project_name;
 """
 
 
@@ -117,12 +122,59 @@ def _serialize_datetime(dt: datetime | None) -> str | None:
 
 
 def _parse_datetime(value: str | None) -> datetime | None:
-    """Parse ISO format string to datetime."""
-    if value is None:
+    """Parse ISO format string to datetime (empty or NULL columns give None)."""
+    if not value:
         return None
     return datetime.fromisoformat(value)
 
 
+def _row_to_project(row: aiosqlite.Row) -> Project:
+    """Build a Project from a projects table row."""
+    return Project(
+        name=row["name"],
+        path=row["path"],
+        description=row["description"],
+        last_accessed_at=_parse_datetime(row["last_accessed_at"]),
+        created_at=_parse_datetime(row["created_at"]) or datetime.now(UTC),
+    )
+
+
+def _row_to_run(row: aiosqlite.Row) -> Run:
+    """Build a Run from a runs table row."""
+    return Run(
+        id=row["id"],
+        user_id=row["user_id"],
+        project_name=row["project_name"],
+        command=row["command"],
+        status=row["status"],
+        started_at=_parse_datetime(row["started_at"]) or datetime.now(UTC),
+        completed_at=_parse_datetime(row["completed_at"]),
+        result=row["result"],
+        error=row["error"],
+    )
+
+
+_INSERT_RUN_SQL = """
+INSERT INTO runs (user_id, project_name, command, status,
+                  started_at, completed_at, result, error)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _run_insert_params(run: Run) -> tuple[Any, ...]:
+    """Build the _INSERT_RUN_SQL parameters for a run."""
+    return (
+        run.user_id,
+        run.project_name,
+        run.command,
+        run.status,
+        _serialize_datetime(run.started_at),
+        _serialize_datetime(run.completed_at),
+        run.result,
+        run.error,
+    )
+
+
 class StateStore:
     """Async SQLite state store for Telegram bot persistence.
 
@@ -164,6 +216,12 @@ class StateStore:
         self._conn = await aiosqlite.connect(str(self.db_path))
         self._conn.row_factory = aiosqlite.Row
 
+        if self.db_path != ":memory:":
+            # In WAL mode a commit is an append to the log, and with
+            # synchronous=NORMAL it is only fsynced at checkpoints
+            await self._conn.execute("PRAGMA journal_mode=WAL")
+            await self._conn.execute("PRAGMA synchronous=NORMAL")
+
         await self._migrate_schema()
 
     async def _migrate_schema(self) -> None:
@@ -300,13 +358,7 @@ class StateStore:
             row = await cursor.fetchone()
             if row is None:
                 return None
-            return Project(
-                name=row["name"],
-                path=row["path"],
-                description=row["description"],
-                last_accessed_at=_parse_datetime(row["last_accessed_at"]),
-                created_at=_parse_datetime(row["created_at"]) or datetime.now(UTC),
-            )
+            return _row_to_project(row)
 
     async def list_projects(self) -> list[Project]:
         """List all registered projects.
@@ -317,19 +369,8 @@ class StateStore:
         if self._conn is None:
             raise RuntimeError("Database not initialized")
 
-        projects = []
         async with self._conn.execute("SELECT * FROM projects ORDER BY name") as cursor:
-            async for row in cursor:
-                projects.append(
-                    Project(
-                        name=row["name"],
-                        path=row["path"],
-                        description=row["description"],
-                        last_accessed_at=_parse_datetime(row["last_accessed_at"]),
-                        created_at=_parse_datetime(row["created_at"]) or datetime.now(UTC),
-                    )
-                )
-        return projects
+            return [_row_to_project(row) async for row in cursor]
 
     async def upsert_project(self, project: Project) -> None:
         """Insert or update project.
@@ -404,26 +445,34 @@ class StateStore:
         if self._conn is None:
             raise RuntimeError("Database not initialized")
 
-        cursor = await self._conn.execute(
-            """
-            INSERT INTO runs (user_id, project_name, command, status,
-                              started_at, completed_at, result, error)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                run.user_id,
-                run.project_name,
-                run.command,
-                run.status,
-                _serialize_datetime(run.started_at),
-                _serialize_datetime(run.completed_at),
-                run.result,
-                run.error,
-            ),
-        )
+        cursor = await self._conn.execute(_INSERT_RUN_SQL, _run_insert_params(run))
         await self._conn.commit()
         return cursor.lastrowid or 0
 
+    async def create_runs(self, runs: list[Run]) -> list[int]:
+        """Create several command run records with a single commit.
+
+        Args:
+            runs: Runs to create (id fields are ignored)
+
+        Returns:
+            IDs of the created runs, in the same order as ``runs``
+        """
+        if self._conn is None:
+            raise RuntimeError("Database not initialized")
+
+        if not runs:
+            return []
+
+        # Take each id from its own cursor: last_insert_rowid() is shared by the
+        # connection, so other inserts awaited in between would skew it
+        run_ids = []
+        for run in runs:
+            cursor = await self._conn.execute(_INSERT_RUN_SQL, _run_insert_params(run))
+            run_ids.append(cursor.lastrowid or 0)
+        await self._conn.commit()
+        return run_ids
+
     async def get_run(self, run_id: int) -> Run | None:
         """Get run by ID.
 
@@ -440,17 +489,7 @@ class StateStore:
             row = await cursor.fetchone()
             if row is None:
                 return None
-            return Run(
-                id=row["id"],
-                user_id=row["user_id"],
-                project_name=row["project_name"],
-                command=row["command"],
-                status=row["status"],
-                started_at=_parse_datetime(row["started_at"]) or datetime.now(UTC),
-                completed_at=_parse_datetime(row["completed_at"]),
-                result=row["result"],
-                error=row["error"],
-            )
+            return _row_to_run(row)
 
     async def update_run(self, run: Run) -> bool:
         """Update an existing run.
@@ -522,23 +561,8 @@ class StateStore:
             """
             params = (user_id, limit)
 
-        runs = []
         async with self._conn.execute(query, params) as cursor:
-            async for row in cursor:
-                runs.append(
-                    Run(
-                        id=row["id"],
-                        user_id=row["user_id"],
-                        project_name=row["project_name"],
-                        command=row["command"],
-                        status=row["status"],
-                        started_at=_parse_datetime(row["started_at"]) or datetime.now(UTC),
-                        completed_at=_parse_datetime(row["completed_at"]),
-                        result=row["result"],
-                        error=row["error"],
-                    )
-                )
-        return runs
+            return [_row_to_run(row) async for row in cursor]
 
     async def list_runs_by_project(self, project_name: str, limit: int = 10) -> list[Run]:
         """List runs for a project.
@@ -553,7 +577,6 @@ class StateStore:
         if self._conn is None:
             raise RuntimeError("Database not initialized")
 
-        runs = []
         async with self._conn.execute(
             """
             SELECT * FROM runs
@@ -563,21 +586,7 @@ class StateStore:
             """,
             (project_name, limit),
         ) as cursor:
-            async for row in cursor:
-                runs.append(
-                    Run(
-                        id=row["id"],
-                        user_id=row["user_id"],
-                        project_name=row["project_name"],
-                        command=row["command"],
-                        status=row["status"],
-                        started_at=_parse_datetime(row["started_at"]) or datetime.now(UTC),
-                        completed_at=_parse_datetime(row["completed_at"]),
-                        result=row["result"],
-                        error=row["error"],
-                    )
-                )
-        return runs
+            return [_row_to_run(row) async for row in cursor]
 
     async def mark_orphaned_runs_failed(self) -> int:
         """Mark any running or pending runs as failed on startup.
@@ -2,12 +2,19 @@
 
 import asyncio
 import contextlib
+from collections.abc import Awaitable, Callable
 from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+import pytest_asyncio
+from aiogram import Bot
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup, Message
 
 from weld.telegram.bot import (
+    _YES_NO_BUTTONS,
     FILE_COMMAND_MAX_SIZE,
     PaginationState,
     _active_tails,
@@ -50,17 +57,26 @@ from weld.telegram.bot import (
 from weld.telegram.config import TelegramConfig, TelegramProject
 from weld.telegram.state import Run, StateStore, UserContext
 
+pytestmark = pytest.mark.unit
+
 
 @pytest.fixture
 def mock_message() -> MagicMock:
-    """Create a mock Telegram message."""
-    message = MagicMock()
+    """Create a mock Telegram message.
+
+    Uses spec=Message so only real Message attributes can be mocked. Pydantic
+    fields are not class attributes, so every field a handler reads is set here.
+    """
+    message = MagicMock(spec=Message)
     message.from_user = MagicMock()
     message.from_user.id = 12345
     message.chat = MagicMock()
     message.chat.id = 67890
     message.message_id = 100
+    message.document = None
+    message.reply_to_message = None
     message.answer = AsyncMock()
+    message.answer_document = AsyncMock()
     return message
 
 
@@ -72,13 +88,45 @@ def mock_command() -> MagicMock:
     return command
 
 
-@pytest.fixture
+@pytest_asyncio.fixture
 async def state_store():
     """Create an in-memory state store for testing."""
     async with StateStore(":memory:") as store:
         yield store
 
 
+# Signature of the seeded_context fixture's factory
+ContextSeeder = Callable[..., Awaitable[UserContext]]
+
+
+@pytest.fixture
+def seeded_context(state_store: StateStore) -> ContextSeeder:
+    """Create a factory that stores a UserContext for the mock message's user.
+
+    Call as ``await seeded_context(current_project="proj")``; extra keyword
+    arguments override the UserContext defaults.
+    """
+
+    async def _seed(current_project: str = "proj", **overrides: Any) -> UserContext:
+        context = UserContext(user_id=12345, current_project=current_project, **overrides)
+        await state_store.upsert_context(context)
+        return context
+
+    return _seed
+
+
+@pytest.fixture
+def empty_state_store() -> MagicMock:
+    """Create a StateStore stand-in with no stored user contexts.
+
+    For negative-path tests that never persist anything, so no SQLite
+    connection needs to be opened.
+    """
+    store = MagicMock(spec=StateStore)
+    store.get_context = AsyncMock(return_value=None)
+    return store
+
+
 @pytest.fixture
 def telegram_config(tmp_path: Path) -> TelegramConfig:
     """Create a test Telegram config with projects."""
@@ -96,6 +144,25 @@ def telegram_config(tmp_path: Path) -> TelegramConfig:
     )
 
 
+@pytest.fixture
+def name_only_config() -> TelegramConfig:
+    """Create a test Telegram config whose project directory is never created.
+
+    For handlers that only look projects up by name and never touch the
+    project directory on disk.
+    """
+    return TelegramConfig(
+        bot_token="123456:ABC",
+        projects=[
+            TelegramProject(
+                name="testproject",
+                path=Path("/nonexistent/testproject"),
+                description="Test project",
+            )
+        ],
+    )
+
+
 @pytest.fixture
 def mock_queue_manager() -> MagicMock:
     """Create a mock QueueManager."""
@@ -194,8 +261,8 @@ def git_project_config(tmp_path: Path) -> TelegramConfig:
 @pytest.fixture
 def mock_bot() -> AsyncMock:
     """Create a mock Bot."""
-    bot = AsyncMock()
-    bot.send_message = AsyncMock(return_value=MagicMock(message_id=100))
+    bot = AsyncMock(spec=Bot)
+    bot.send_message = AsyncMock(return_value=SimpleNamespace(message_id=100))
     bot.send_document = AsyncMock()
     bot.get_file = AsyncMock()
     bot.download_file = AsyncMock()
@@ -203,28 +270,43 @@ def mock_bot() -> AsyncMock:
     return bot
 
 
-@pytest.mark.unit
+@pytest.fixture
+def send_input_mock(monkeypatch: pytest.MonkeyPatch) -> AsyncMock:
+    """Replace send_input in the bot module with an AsyncMock."""
+    mock = AsyncMock()
+    monkeypatch.setattr("weld.telegram.bot.send_input", mock)
+    return mock
+
+
+@pytest.fixture(scope="class")
+def select_keyboard() -> InlineKeyboardMarkup:
+    """Three-option select keyboard, built once per test class."""
+    return create_prompt_keyboard(42, ["1", "2", "3"], "select")
+
+
 class TestCreatePromptKeyboard:
     """Tests for create_prompt_keyboard function."""
 
-    def test_creates_keyboard_with_select_options(self) -> None:
+    def test_creates_keyboard_with_select_options(
+        self, select_keyboard: InlineKeyboardMarkup
+    ) -> None:
         """Creates keyboard with provided select options."""
-        keyboard = create_prompt_keyboard(42, ["1", "2", "3"], "select")
-        assert keyboard.inline_keyboard is not None
-        assert len(keyboard.inline_keyboard) == 1
-        assert len(keyboard.inline_keyboard[0]) == 3
+        assert select_keyboard.inline_keyboard is not None
+        assert len(select_keyboard.inline_keyboard) == 1
+        assert len(select_keyboard.inline_keyboard[0]) == 3
 
-    def test_buttons_have_correct_callback_data(self) -> None:
+    def test_buttons_have_correct_callback_data(
+        self, select_keyboard: InlineKeyboardMarkup
+    ) -> None:
         """Buttons have correct callback_data format."""
-        keyboard = create_prompt_keyboard(42, ["1", "2"], "select")
-        buttons = keyboard.inline_keyboard[0]
+        buttons = select_keyboard.inline_keyboard[0]
         assert buttons[0].callback_data == "prompt:42:1"
         assert buttons[1].callback_data == "prompt:42:2"
+        assert buttons[2].callback_data == "prompt:42:3"
 
-    def test_select_options_use_value_as_label(self) -> None:
+    def test_select_options_use_value_as_label(self, select_keyboard: InlineKeyboardMarkup) -> None:
         """Select options use the option value as label."""
-        keyboard = create_prompt_keyboard(1, ["1", "2", "3"], "select")
-        buttons = keyboard.inline_keyboard[0]
+        buttons = select_keyboard.inline_keyboard[0]
         assert buttons[0].text == "1"
         assert buttons[1].text == "2"
         assert buttons[2].text == "3"
@@ -240,6 +322,14 @@ class TestCreatePromptKeyboard:
         assert buttons[0].callback_data == "prompt:1:y"
         assert buttons[1].callback_data == "prompt:1:n"
 
+    def test_yes_no_buttons_use_label_table(self) -> None:
+        """yes_no buttons take labels from _YES_NO_BUTTONS and vary only by run_id."""
+        for run_id in (7, 8):
+            buttons = create_prompt_keyboard(run_id, ["y", "n"], "yes_no").inline_keyboard[0]
+            assert [(b.text, b.callback_data) for b in buttons] == [
+                (label, f"prompt:{run_id}:{value}") for label, value in _YES_NO_BUTTONS
+            ]
+
     def test_confirm_creates_yes_no_buttons(self) -> None:
         """confirm prompt type creates Yes/No buttons."""
         keyboard = create_prompt_keyboard(1, ["y", "n"], "confirm")
@@ -301,7 +391,6 @@ class TestCreatePromptKeyboard:
 
 
 @pytest.mark.asyncio
-@pytest.mark.unit
 class TestHandlePromptCallback:
     """Tests for handle_prompt_callback function."""
 
@@ -345,75 +434,66 @@ class TestHandlePromptCallback:
 
         callback.answer.assert_not_called()
 
-    async def test_sends_input_and_acknowledges(self) -> None:
+    async def test_sends_input_and_acknowledges(self, send_input_mock: AsyncMock) -> None:
         """Sends input to process and acknowledges callback."""
         callback = MagicMock()
         callback.data = "prompt:42:2"
         callback.answer = AsyncMock()
         callback.message = MagicMock()
         callback.message.edit_text = AsyncMock()
+        send_input_mock.return_value = True
 
-        with patch("weld.telegram.bot.send_input", new_callable=AsyncMock) as mock_send:
-            mock_send.return_value = True
-            await handle_prompt_callback(callback)
+        await handle_prompt_callback(callback)
 
-            mock_send.assert_called_once_with(42, "2")
-            callback.answer.assert_called_once()
-            assert "Selected option 2" in str(callback.answer.call_args)
+        send_input_mock.assert_called_once_with(42, "2")
+        callback.answer.assert_called_once()
+        assert "Selected option 2" in callback.answer.call_args.args[0]
 
-    async def test_shows_alert_when_command_not_running(self) -> None:
+    async def test_shows_alert_when_command_not_running(self, send_input_mock: AsyncMock) -> None:
         """Shows alert when command is no longer running."""
         callback = MagicMock()
         callback.data = "prompt:42:1"
         callback.answer = AsyncMock()
+        send_input_mock.return_value = False
 
-        with patch("weld.telegram.bot.send_input", new_callable=AsyncMock) as mock_send:
-            mock_send.return_value = False
-            await handle_prompt_callback(callback)
+        await handle_prompt_callback(callback)
 
-            callback.answer.assert_called_once()
-            assert callback.answer.call_args[1].get("show_alert") is True
+        callback.answer.assert_called_once()
+        assert callback.answer.call_args[1].get("show_alert") is True
 
 
-@pytest.mark.unit
 class TestEscapeMarkdown:
     """Tests for _escape_markdown function."""
 
-    def test_escapes_asterisk(self) -> None:
-        """Escapes asterisk character."""
-        assert _escape_markdown("*bold*") == "\\*bold\\*"
-
-    def test_escapes_underscore(self) -> None:
-        """Escapes underscore character."""
-        assert _escape_markdown("_italic_") == "\\_italic\\_"
-
-    def test_escapes_backtick(self) -> None:
-        """Escapes backtick character."""
-        assert _escape_markdown("`code`") == "\\`code\\`"
-
-    def test_escapes_bracket(self) -> None:
-        """Escapes square bracket character."""
-        assert _escape_markdown("[link]") == "\\[link]"
-
-    def test_escapes_multiple_chars(self) -> None:
-        """Escapes multiple special characters in same string."""
-        text = "*bold* and _italic_ and `code`"
-        escaped = _escape_markdown(text)
-        assert "\\*" in escaped
-        assert "\\_" in escaped
-        assert "\\`" in escaped
-
-    def test_plain_text_unchanged(self) -> None:
-        """Plain text without special chars is unchanged."""
-        text = "Hello world"
-        assert _escape_markdown(text) == text
-
-    def test_empty_string(self) -> None:
-        """Empty string returns empty string."""
-        assert _escape_markdown("") == ""
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ("*bold*", "\\*bold\\*"),
+            ("_italic_", "\\_italic\\_"),
+            ("`code`", "\\`code\\`"),
+            ("[link]", "\\[link]"),
+            (
+                "*bold* and _italic_ and `code`",
+                "\\*bold\\* and \\_italic\\_ and \\`code\\`",
+            ),
+            ("Hello world", "Hello world"),
+            ("", ""),
+        ],
+        ids=[
+            "asterisk",
+            "underscore",
+            "backtick",
+            "bracket",
+            "multiple_chars",
+            "plain_text_unchanged",
+            "empty_string",
+        ],
+    )
+    def test_escape(self, text: str, expected: str) -> None:
+        """Escapes Markdown special characters and leaves other text unchanged."""
+        assert _escape_markdown(text) == expected
 
 
-@pytest.mark.unit
 class TestCreateBot:
     """Tests for create_bot function."""
 
@@ -454,87 +534,65 @@ class TestCreateBot:
         assert bot is not None
 
 
-@pytest.mark.unit
 class TestSanitizeCommandArgs:
     """Tests for _sanitize_command_args function."""
 
-    def test_empty_string_returns_empty(self) -> None:
-        """Empty string returns empty string."""
-        assert _sanitize_command_args("") == ""
-
-    def test_none_handled(self) -> None:
-        """None-like empty values handled."""
-        assert _sanitize_command_args("   ") == ""
-
-    def test_removes_null_bytes(self) -> None:
-        """Removes null bytes from args."""
-        assert _sanitize_command_args("hello\0world") == "helloworld"
-
-    def test_normalizes_em_dash_to_double_hyphen(self) -> None:
-        """Normalizes em-dash (—) to double hyphen (--)."""
-        assert _sanitize_command_args("—option") == "--option"
-
-    def test_normalizes_en_dash_to_double_hyphen(self) -> None:
-        """Normalizes en-dash to double hyphen (--)."""
-        assert _sanitize_command_args("\u2013option") == "--option"
-
-    def test_removes_semicolon(self) -> None:
-        """Removes semicolon to prevent command chaining."""
-        assert _sanitize_command_args("arg1; rm -rf") == "arg1 rm -rf"
-
-    def test_removes_ampersand(self) -> None:
-        """Removes ampersand to prevent background execution."""
-        assert _sanitize_command_args("arg1 && arg2") == "arg1  arg2"
-
-    def test_removes_pipe(self) -> None:
-        """Removes pipe to prevent command piping."""
-        assert _sanitize_command_args("arg1 | arg2") == "arg1  arg2"
-
-    def test_removes_dollar(self) -> None:
-        """Removes dollar sign to prevent variable expansion."""
-        assert _sanitize_command_args("$HOME") == "HOME"
-
-    def test_removes_backtick(self) -> None:
-        """Removes backtick to prevent command substitution."""
-        assert _sanitize_command_args("`whoami`") == "whoami"
-
-    def test_removes_parentheses(self) -> None:
-        """Removes parentheses to prevent subshell."""
-        assert _sanitize_command_args("(echo hi)") == "echo hi"
-
-    def test_removes_braces(self) -> None:
-        """Removes braces to prevent brace expansion."""
-        assert _sanitize_command_args("{a,b}") == "a,b"
-
-    def test_removes_redirects(self) -> None:
-        """Removes redirect characters."""
-        # Note: result is stripped, so leading space is removed
-        assert _sanitize_command_args("> file") == "file"
-        assert _sanitize_command_args("< input") == "input"
-        assert _sanitize_command_args("echo > file") == "echo  file"
-
-    def test_removes_newlines(self) -> None:
-        """Removes newlines to prevent multi-line injection."""
-        assert _sanitize_command_args("arg1\narg2") == "arg1arg2"
-        assert _sanitize_command_args("arg1\rarg2") == "arg1arg2"
-
-    def test_preserves_safe_characters(self) -> None:
-        """Preserves alphanumeric, space, dash, underscore, dot, slash."""
-        safe_args = "my-file_name.md /path/to/file"
-        assert _sanitize_command_args(safe_args) == safe_args
-
-    def test_preserves_quotes(self) -> None:
-        """Preserves quote characters."""
-        assert _sanitize_command_args('"quoted"') == '"quoted"'
-        assert _sanitize_command_args("'single'") == "'single'"
-
-    def test_strips_result(self) -> None:
-        """Strips leading/trailing whitespace from result."""
-        assert _sanitize_command_args("  args  ") == "args"
+    @pytest.mark.parametrize(
+        ("args", "expected"),
+        [
+            ("", ""),
+            ("   ", ""),
+            ("hello\0world", "helloworld"),
+            ("—option", "--option"),
+            ("\u2013option", "--option"),
+            ("arg1; rm -rf", "arg1 rm -rf"),
+            ("arg1 && arg2", "arg1  arg2"),
+            ("arg1 | arg2", "arg1  arg2"),
+            ("$HOME", "HOME"),
+            ("`whoami`", "whoami"),
+            ("(echo hi)", "echo hi"),
+            ("{a,b}", "a,b"),
+            # Result is stripped, so the leading space is removed
+            ("> file", "file"),
+            ("< input", "input"),
+            ("echo > file", "echo  file"),
+            ("arg1\narg2", "arg1arg2"),
+            ("arg1\rarg2", "arg1arg2"),
+            ("my-file_name.md /path/to/file", "my-file_name.md /path/to/file"),
+            ('"quoted"', '"quoted"'),
+            ("'single'", "'single'"),
+            ("  args  ", "args"),
+        ],
+        ids=[
+            "empty_string",
+            "whitespace_only",
+            "null_bytes",
+            "em_dash",
+            "en_dash",
+            "semicolon",
+            "ampersand",
+            "pipe",
+            "dollar",
+            "backtick",
+            "parentheses",
+            "braces",
+            "redirect_out_leading",
+            "redirect_in_leading",
+            "redirect_out_inline",
+            "newline",
+            "carriage_return",
+            "safe_characters",
+            "double_quotes",
+            "single_quotes",
+            "strips_result",
+        ],
+    )
+    def test_sanitize(self, args: str, expected: str) -> None:
+        """Removes shell metacharacters, normalizes dashes, and strips the result."""
+        assert _sanitize_command_args(args) == expected
 
 
 @pytest.mark.asyncio
-@pytest.mark.unit
 class TestUseCommand:
     """Tests for use_command function."""
 
@@ -542,13 +600,13 @@ class TestUseCommand:
         self,
         mock_message: MagicMock,
         mock_command: MagicMock,
-        state_store: StateStore,
-        telegram_config: TelegramConfig,
+        empty_state_store: MagicMock,
+        name_only_config: TelegramConfig,
     ) -> None:
         """Shows available projects when no project selected."""
         mock_command.args = None
 
-        await use_command(mock_message, mock_command, state_store, telegram_config)
+        await use_command(mock_message, mock_command, empty_state_store, name_only_config)
 
         mock_message.answer.assert_called_once()
         response = mock_message.answer.call_args[0][0]
@@ -560,16 +618,16 @@ class TestUseCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
-        telegram_config: TelegramConfig,
+        seeded_context: ContextSeeder,
+        name_only_config: TelegramConfig,
     ) -> None:
         """Shows current project when one is selected."""
         mock_command.args = None
 
         # Set up existing context
-        context = UserContext(user_id=12345, current_project="testproject")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="testproject")
 
-        await use_command(mock_message, mock_command, state_store, telegram_config)
+        await use_command(mock_message, mock_command, state_store, name_only_config)
 
         response = mock_message.answer.call_args[0][0]
         assert "Current project" in response
@@ -580,12 +638,12 @@ class TestUseCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
-        telegram_config: TelegramConfig,
+        name_only_config: TelegramConfig,
     ) -> None:
         """Switches to specified valid project."""
         mock_command.args = "testproject"
 
-        await use_command(mock_message, mock_command, state_store, telegram_config)
+        await use_command(mock_message, mock_command, state_store, name_only_config)
 
         mock_message.answer.assert_called_once()
         response = mock_message.answer.call_args[0][0]
@@ -601,13 +659,13 @@ class TestUseCommand:
         self,
         mock_message: MagicMock,
         mock_command: MagicMock,
-        state_store: StateStore,
-        telegram_config: TelegramConfig,
+        empty_state_store: MagicMock,
+        name_only_config: TelegramConfig,
     ) -> None:
         """Rejects switch to unknown project."""
         mock_command.args = "nonexistent"
 
-        await use_command(mock_message, mock_command, state_store, telegram_config)
+        await use_command(mock_message, mock_command, empty_state_store, name_only_config)
 
         response = mock_message.answer.call_args[0][0]
         assert "Unknown project" in response
@@ -618,16 +676,16 @@ class TestUseCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
-        telegram_config: TelegramConfig,
+        seeded_context: ContextSeeder,
+        name_only_config: TelegramConfig,
     ) -> None:
         """Blocks project switch while command is running."""
         mock_command.args = "testproject"
 
         # Set up running context
-        context = UserContext(user_id=12345, current_project="other", conversation_state="running")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="other", conversation_state="running")
 
-        await use_command(mock_message, mock_command, state_store, telegram_config)
+        await use_command(mock_message, mock_command, state_store, name_only_config)
 
         response = mock_message.answer.call_args[0][0]
         assert "Cannot switch" in response
@@ -636,13 +694,13 @@ class TestUseCommand:
         self,
         mock_message: MagicMock,
         mock_command: MagicMock,
-        state_store: StateStore,
-        telegram_config: TelegramConfig,
+        empty_state_store: MagicMock,
+        name_only_config: TelegramConfig,
     ) -> None:
         """Handles message with no from_user."""
         mock_message.from_user = None
 
-        await use_command(mock_message, mock_command, state_store, telegram_config)
+        await use_command(mock_message, mock_command, empty_state_store, name_only_config)
 
         response = mock_message.answer.call_args[0][0]
         assert "Unable to identify user" in response
@@ -651,20 +709,19 @@ class TestUseCommand:
         self,
         mock_message: MagicMock,
         mock_command: MagicMock,
-        state_store: StateStore,
+        empty_state_store: MagicMock,
     ) -> None:
         """Shows helpful message when no projects are configured."""
         mock_command.args = None
         empty_config = TelegramConfig(bot_token="123:ABC", projects=[])
 
-        await use_command(mock_message, mock_command, state_store, empty_config)
+        await use_command(mock_message, mock_command, empty_state_store, empty_config)
 
         response = mock_message.answer.call_args[0][0]
         assert "No projects configured" in response
 
 
 @pytest.mark.asyncio
-@pytest.mark.unit
 class TestStatusCommand:
     """Tests for status_command function."""
 
@@ -687,12 +744,12 @@ class TestStatusCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         mock_queue_manager: MagicMock,
     ) -> None:
         """Shows current project in status."""
         mock_command.args = ""
-        context = UserContext(user_id=12345, current_project="myproject")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="myproject")
 
         await status_command(mock_message, mock_command, state_store, mock_queue_manager)
 
@@ -781,21 +838,20 @@ class TestStatusCommand:
         self,
         mock_message: MagicMock,
         mock_command: MagicMock,
-        state_store: StateStore,
+        empty_state_store: MagicMock,
         mock_queue_manager: MagicMock,
     ) -> None:
         """Handles message with no from_user."""
         mock_command.args = ""
         mock_message.from_user = None
 
-        await status_command(mock_message, mock_command, state_store, mock_queue_manager)
+        await status_command(mock_message, mock_command, empty_state_store, mock_queue_manager)
 
         response = mock_message.answer.call_args[0][0]
         assert "Unable to identify user" in response
 
 
 @pytest.mark.asyncio
-@pytest.mark.unit
 class TestCancelCommand:
     """Tests for cancel_command function."""
 
@@ -846,14 +902,12 @@ class TestCancelCommand:
         mock_queue_manager.cancel_pending.return_value = 5
 
         # Create pending runs
-        for i in range(5):
-            run = Run(
-                user_id=12345,
-                project_name="proj",
-                command=f"weld cmd{i}",
-                status="pending",
-            )
-            await state_store.create_run(run)
+        await state_store.create_runs(
+            [
+                Run(user_id=12345, project_name="proj", command=f"weld cmd{i}", status="pending")
+                for i in range(5)
+            ]
+        )
 
         await cancel_command(mock_message, state_store, mock_queue_manager)
 
@@ -865,15 +919,11 @@ class TestCancelCommand:
         self,
         mock_message: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         mock_queue_manager: MagicMock,
     ) -> None:
         """Resets user context state to idle after cancel."""
-        context = UserContext(
-            user_id=12345,
-            current_project="proj",
-            conversation_state="running",
-        )
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="proj", conversation_state="running")
 
         run = Run(
             user_id=12345,
@@ -892,20 +942,19 @@ class TestCancelCommand:
     async def test_handles_no_user(
         self,
         mock_message: MagicMock,
-        state_store: StateStore,
+        empty_state_store: MagicMock,
         mock_queue_manager: MagicMock,
     ) -> None:
         """Handles message with no from_user."""
         mock_message.from_user = None
 
-        await cancel_command(mock_message, state_store, mock_queue_manager)
+        await cancel_command(mock_message, empty_state_store, mock_queue_manager)
 
         response = mock_message.answer.call_args[0][0]
         assert "Unable to identify user" in response
 
 
 @pytest.mark.asyncio
-@pytest.mark.unit
 class TestEnqueueWeldCommand:
     """Tests for weld command enqueueing (via doctor_command as example)."""
 
@@ -913,7 +962,7 @@ class TestEnqueueWeldCommand:
         self,
         mock_message: MagicMock,
         mock_command: MagicMock,
-        state_store: StateStore,
+        empty_state_store: MagicMock,
         mock_queue_manager: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
@@ -921,7 +970,7 @@ class TestEnqueueWeldCommand:
         mock_command.args = None
 
         await doctor_command(
-            mock_message, mock_command, state_store, mock_queue_manager, telegram_config
+            mock_message, mock_command, empty_state_store, mock_queue_manager, telegram_config
         )
 
         response = mock_message.answer.call_args[0][0]
@@ -932,14 +981,14 @@ class TestEnqueueWeldCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         mock_queue_manager: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
         """Enqueues command when project is selected."""
         mock_command.args = None
 
-        context = UserContext(user_id=12345, current_project="proj")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="proj")
 
         await doctor_command(
             mock_message, mock_command, state_store, mock_queue_manager, telegram_config
@@ -954,6 +1003,7 @@ class TestEnqueueWeldCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         mock_queue_manager: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
@@ -961,8 +1011,7 @@ class TestEnqueueWeldCommand:
         mock_command.args = None
         mock_queue_manager.enqueue.return_value = 3
 
-        context = UserContext(user_id=12345, current_project="proj")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="proj")
 
         await doctor_command(
             mock_message, mock_command, state_store, mock_queue_manager, telegram_config
@@ -976,6 +1025,7 @@ class TestEnqueueWeldCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         mock_queue_manager: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
@@ -983,8 +1033,7 @@ class TestEnqueueWeldCommand:
         mock_command.args = None
         mock_queue_manager.enqueue.return_value = 1
 
-        context = UserContext(user_id=12345, current_project="proj")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="proj")
 
         await doctor_command(
             mock_message, mock_command, state_store, mock_queue_manager, telegram_config
@@ -998,14 +1047,14 @@ class TestEnqueueWeldCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         mock_queue_manager: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
         """Sanitizes command arguments."""
         mock_command.args = "file.md; rm -rf /"
 
-        context = UserContext(user_id=12345, current_project="proj")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="proj")
 
         await plan_command(
             mock_message, mock_command, state_store, mock_queue_manager, telegram_config
@@ -1021,6 +1070,7 @@ class TestEnqueueWeldCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         mock_queue_manager: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
@@ -1028,8 +1078,7 @@ class TestEnqueueWeldCommand:
         mock_command.args = None
         mock_queue_manager.enqueue.side_effect = Exception("Queue error")
 
-        context = UserContext(user_id=12345, current_project="proj")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="proj")
 
         await doctor_command(
             mock_message, mock_command, state_store, mock_queue_manager, telegram_config
@@ -1040,7 +1089,6 @@ class TestEnqueueWeldCommand:
 
 
 @pytest.mark.asyncio
-@pytest.mark.unit
 class TestWeldCommandHandlers:
     """Tests for specific weld command handlers."""
 
@@ -1049,13 +1097,13 @@ class TestWeldCommandHandlers:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         mock_queue_manager: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
         """plan_command enqueues weld plan."""
         mock_command.args = "spec.md"
-        context = UserContext(user_id=12345, current_project="proj")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="proj")
 
         await plan_command(
             mock_message, mock_command, state_store, mock_queue_manager, telegram_config
@@ -1070,13 +1118,13 @@ class TestWeldCommandHandlers:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         mock_queue_manager: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
         """interview_command enqueues weld interview."""
         mock_command.args = None
-        context = UserContext(user_id=12345, current_project="proj")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="proj")
 
         await interview_command(
             mock_message, mock_command, state_store, mock_queue_manager, telegram_config
@@ -1090,13 +1138,13 @@ class TestWeldCommandHandlers:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         mock_queue_manager: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
         """implement_command enqueues weld implement."""
         mock_command.args = "plan.md --phase 1"
-        context = UserContext(user_id=12345, current_project="proj")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="proj")
 
         await implement_command(
             mock_message, mock_command, state_store, mock_queue_manager, telegram_config
@@ -1111,13 +1159,13 @@ class TestWeldCommandHandlers:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         mock_queue_manager: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
         """commit_command enqueues weld commit."""
         mock_command.args = "-m 'test commit'"
-        context = UserContext(user_id=12345, current_project="proj")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="proj")
 
         await commit_command(
             mock_message, mock_command, state_store, mock_queue_manager, telegram_config
@@ -1128,7 +1176,6 @@ class TestWeldCommandHandlers:
 
 
 @pytest.mark.asyncio
-@pytest.mark.unit
 class TestWeldCommand:
     """Tests for weld_command function (generic /weld handler)."""
 
@@ -1173,7 +1220,7 @@ class TestWeldCommand:
         self,
         mock_message: MagicMock,
         mock_command: MagicMock,
-        state_store: StateStore,
+        empty_state_store: MagicMock,
         mock_queue_manager: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
@@ -1181,7 +1228,7 @@ class TestWeldCommand:
         mock_command.args = "research spec.md"
 
         await weld_command(
-            mock_message, mock_command, state_store, mock_queue_manager, telegram_config
+            mock_message, mock_command, empty_state_store, mock_queue_manager, telegram_config
         )
 
         response = mock_message.answer.call_args[0][0]
@@ -1192,13 +1239,13 @@ class TestWeldCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         mock_queue_manager: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
         """Enqueues weld command with subcommand and arguments."""
         mock_command.args = "research spec.md"
-        context = UserContext(user_id=12345, current_project="proj")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="proj")
 
         await weld_command(
             mock_message, mock_command, state_store, mock_queue_manager, telegram_config
@@ -1214,13 +1261,13 @@ class TestWeldCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         mock_queue_manager: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
         """Enqueues weld command with subcommand only."""
         mock_command.args = "discover"
-        context = UserContext(user_id=12345, current_project="proj")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="proj")
 
         await weld_command(
             mock_message, mock_command, state_store, mock_queue_manager, telegram_config
@@ -1235,13 +1282,13 @@ class TestWeldCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         mock_queue_manager: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
         """Blocks the telegram subcommand for safety."""
         mock_command.args = "telegram serve"
-        context = UserContext(user_id=12345, current_project="proj")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="proj")
 
         await weld_command(
             mock_message, mock_command, state_store, mock_queue_manager, telegram_config
@@ -1257,13 +1304,13 @@ class TestWeldCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         mock_queue_manager: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
         """Rejects subcommand with invalid characters."""
         mock_command.args = "sub;cmd"
-        context = UserContext(user_id=12345, current_project="proj")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="proj")
 
         await weld_command(
             mock_message, mock_command, state_store, mock_queue_manager, telegram_config
@@ -1278,13 +1325,13 @@ class TestWeldCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         mock_queue_manager: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
         """Accepts subcommand with dashes and underscores."""
         mock_command.args = "my-custom_cmd"
-        context = UserContext(user_id=12345, current_project="proj")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="proj")
 
         await weld_command(
             mock_message, mock_command, state_store, mock_queue_manager, telegram_config
@@ -1301,13 +1348,13 @@ class TestWeldCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         mock_queue_manager: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
         """Sanitizes arguments to prevent injection."""
         mock_command.args = "review file.py; rm -rf /"
-        context = UserContext(user_id=12345, current_project="proj")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="proj")
 
         await weld_command(
             mock_message, mock_command, state_store, mock_queue_manager, telegram_config
@@ -1323,14 +1370,14 @@ class TestWeldCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         mock_queue_manager: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
         """Shows position when not first in queue."""
         mock_command.args = "init"
         mock_queue_manager.enqueue.return_value = 3
-        context = UserContext(user_id=12345, current_project="proj")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="proj")
 
         await weld_command(
             mock_message, mock_command, state_store, mock_queue_manager, telegram_config
@@ -1344,14 +1391,14 @@ class TestWeldCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         mock_queue_manager: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
         """Shows 'next up' when first in queue."""
         mock_command.args = "init"
         mock_queue_manager.enqueue.return_value = 1
-        context = UserContext(user_id=12345, current_project="proj")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="proj")
 
         await weld_command(
             mock_message, mock_command, state_store, mock_queue_manager, telegram_config
@@ -1365,14 +1412,14 @@ class TestWeldCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         mock_queue_manager: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
         """Handles queue failure gracefully."""
         mock_command.args = "review"
         mock_queue_manager.enqueue.side_effect = Exception("Queue error")
-        context = UserContext(user_id=12345, current_project="proj")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="proj")
 
         await weld_command(
             mock_message, mock_command, state_store, mock_queue_manager, telegram_config
@@ -1385,7 +1432,7 @@ class TestWeldCommand:
         self,
         mock_message: MagicMock,
         mock_command: MagicMock,
-        state_store: StateStore,
+        empty_state_store: MagicMock,
         mock_queue_manager: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
@@ -1394,7 +1441,7 @@ class TestWeldCommand:
         mock_command.args = "discover"
 
         await weld_command(
-            mock_message, mock_command, state_store, mock_queue_manager, telegram_config
+            mock_message, mock_command, empty_state_store, mock_queue_manager, telegram_config
         )
 
         response = mock_message.answer.call_args[0][0]
@@ -1405,13 +1452,13 @@ class TestWeldCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         mock_queue_manager: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
         """Subcommand is converted to lowercase."""
         mock_command.args = "DISCOVER"
-        context = UserContext(user_id=12345, current_project="proj")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="proj")
 
         await weld_command(
             mock_message, mock_command, state_store, mock_queue_manager, telegram_config
@@ -1422,7 +1469,6 @@ class TestWeldCommand:
 
 
 @pytest.mark.asyncio
-@pytest.mark.unit
 class TestFetchCommand:
     """Tests for fetch_command function."""
 
@@ -1567,7 +1613,6 @@ class TestFetchCommand:
 
 
 @pytest.mark.asyncio
-@pytest.mark.unit
 class TestPushCommand:
     """Tests for push_command function."""
 
@@ -1721,7 +1766,6 @@ class TestPushCommand:
 
 
 @pytest.mark.asyncio
-@pytest.mark.unit
 class TestRunConsumer:
     """Tests for run_consumer function."""
 
@@ -1921,7 +1965,6 @@ class TestRunConsumer:
 
 
 @pytest.mark.asyncio
-@pytest.mark.unit
 class TestDocumentHandler:
     """Tests for document_handler function (automatic file uploads)."""
 
@@ -1939,7 +1982,7 @@ class TestDocumentHandler:
     async def test_requires_user_context(
         self,
         mock_document_message: MagicMock,
-        state_store: StateStore,
+        empty_state_store: MagicMock,
         telegram_config: TelegramConfig,
         mock_bot: AsyncMock,
     ) -> None:
@@ -1947,7 +1990,7 @@ class TestDocumentHandler:
         from weld.telegram.bot import document_handler
 
         # Don't set up user context - should trigger "No project selected"
-        await document_handler(mock_document_message, state_store, telegram_config, mock_bot)
+        await document_handler(mock_document_message, empty_state_store, telegram_config, mock_bot)
 
         # Should show "No project selected" message
         response = mock_document_message.answer.call_args[0][0]
@@ -1993,14 +2036,14 @@ class TestDocumentHandler:
         self,
         mock_document_message: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
         mock_bot: AsyncMock,
     ) -> None:
         """Downloads and saves file with allowed extension."""
         from weld.telegram.bot import document_handler
 
-        context = UserContext(user_id=12345, current_project="testproject")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="testproject")
 
         # Mock file download
         mock_file = MagicMock()
@@ -2025,6 +2068,7 @@ class TestDocumentHandler:
         self,
         mock_message: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
         mock_bot: AsyncMock,
     ) -> None:
@@ -2033,8 +2077,7 @@ class TestDocumentHandler:
 
         mock_message.document = None
         mock_message.reply_to_message = None
-        context = UserContext(user_id=12345, current_project="testproject")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="testproject")
 
         # Should not raise, just return silently
         await document_handler(mock_message, state_store, telegram_config, mock_bot)
@@ -2045,7 +2088,7 @@ class TestDocumentHandler:
     async def test_handles_no_user(
         self,
         mock_document_message: MagicMock,
-        state_store: StateStore,
+        empty_state_store: MagicMock,
         telegram_config: TelegramConfig,
         mock_bot: AsyncMock,
     ) -> None:
@@ -2054,7 +2097,7 @@ class TestDocumentHandler:
 
         mock_document_message.from_user = None
 
-        await document_handler(mock_document_message, state_store, telegram_config, mock_bot)
+        await document_handler(mock_document_message, empty_state_store, telegram_config, mock_bot)
 
         # Handler sends "Unable to identify user" message
         response = mock_document_message.answer.call_args[0][0]
@@ -2064,14 +2107,14 @@ class TestDocumentHandler:
         self,
         mock_document_message: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
         mock_bot: AsyncMock,
     ) -> None:
         """Handles Telegram file download failures gracefully."""
         from weld.telegram.bot import document_handler
 
-        context = UserContext(user_id=12345, current_project="testproject")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="testproject")
 
         # Mock download failure
         mock_bot.get_file.side_effect = Exception("Download failed")
@@ -2085,14 +2128,14 @@ class TestDocumentHandler:
         self,
         mock_document_message: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
         mock_bot: AsyncMock,
     ) -> None:
         """Accepts various allowed file extensions."""
         from weld.telegram.bot import document_handler
 
-        context = UserContext(user_id=12345, current_project="testproject")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="testproject")
 
         mock_file = MagicMock()
         mock_file.file_path = "/path/to/file"
@@ -2135,7 +2178,6 @@ class TestDocumentHandler:
         mock_document_message.answer.assert_not_called()
 
 
-@pytest.mark.unit
 class TestFindUploadedFile:
     """Tests for _find_uploaded_file function."""
 
@@ -2212,7 +2254,6 @@ class TestFindUploadedFile:
 
 
 @pytest.mark.asyncio
-@pytest.mark.unit
 class TestReplyToDocumentInjection:
     """Tests for reply-to-document file path auto-injection in commands."""
 
@@ -2221,13 +2262,13 @@ class TestReplyToDocumentInjection:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         mock_queue_manager: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
         """Injects uploaded file path when command replies to document."""
         # Set up context
-        context = UserContext(user_id=12345, current_project="testproject")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="testproject")
 
         # Set up reply to document
         mock_command.args = "--force"
@@ -2256,13 +2297,13 @@ class TestReplyToDocumentInjection:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         mock_queue_manager: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
         """Shows error when reply-to document file not found."""
         # Set up context
-        context = UserContext(user_id=12345, current_project="testproject")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="testproject")
 
         # Set up reply to document (but don't create the file)
         mock_command.args = ""
@@ -2283,13 +2324,13 @@ class TestReplyToDocumentInjection:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         mock_queue_manager: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
         """Does not inject path when not a reply to document."""
         # Set up context
-        context = UserContext(user_id=12345, current_project="testproject")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="testproject")
 
         mock_command.args = "myspec.md"
         mock_message.reply_to_message = None
@@ -2308,13 +2349,13 @@ class TestReplyToDocumentInjection:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         mock_queue_manager: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
         """Generic /weld command also supports file path injection."""
         # Set up context
-        context = UserContext(user_id=12345, current_project="testproject")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="testproject")
 
         # Set up reply to document
         mock_command.args = "research"
@@ -2338,7 +2379,6 @@ class TestReplyToDocumentInjection:
         assert "weld research" in response
 
 
-@pytest.mark.unit
 class TestDetectOutputFiles:
     """Tests for detect_output_files function."""
 
@@ -2595,7 +2635,6 @@ class TestDetectOutputFiles:
             test_file.unlink()
 
 
-@pytest.mark.unit
 class TestCreateDownloadKeyboard:
     """Tests for create_download_keyboard function."""
 
@@ -2642,14 +2681,14 @@ class TestCreateDownloadKeyboard:
 
 
 @pytest.mark.asyncio
-@pytest.mark.unit
 class TestHandleFetchCallback:
     """Tests for handle_fetch_callback function."""
 
     @pytest.fixture
     def mock_callback(self) -> MagicMock:
         """Create mock callback query."""
-        callback = MagicMock()
+        callback = MagicMock(spec=CallbackQuery)
+        callback.data = None
         callback.from_user = MagicMock()
         callback.from_user.id = 12345
         callback.message = MagicMock()
@@ -2686,7 +2725,7 @@ class TestHandleFetchCallback:
         await handle_fetch_callback(mock_callback, MagicMock(), AsyncMock(), state_store)
 
         mock_callback.answer.assert_called_once()
-        assert "Invalid" in str(mock_callback.answer.call_args)
+        assert "Invalid" in mock_callback.answer.call_args.args[0]
 
     async def test_rejects_no_user(self, mock_callback: MagicMock) -> None:
         """Shows alert when user cannot be identified."""
@@ -2697,86 +2736,86 @@ class TestHandleFetchCallback:
         await handle_fetch_callback(mock_callback, MagicMock(), AsyncMock(), MagicMock())
 
         mock_callback.answer.assert_called_once()
-        assert "identify user" in str(mock_callback.answer.call_args)
+        assert "identify user" in mock_callback.answer.call_args.args[0]
 
     async def test_rejects_no_project_context(
-        self, mock_callback: MagicMock, state_store: StateStore
+        self, mock_callback: MagicMock, empty_state_store: MagicMock
     ) -> None:
         """Shows alert when user has no project selected."""
 
         mock_callback.data = "fetch:file.md"
         # No context set up
 
-        await handle_fetch_callback(mock_callback, MagicMock(), AsyncMock(), state_store)
+        await handle_fetch_callback(mock_callback, MagicMock(), AsyncMock(), empty_state_store)
 
         mock_callback.answer.assert_called_once()
-        assert "project" in str(mock_callback.answer.call_args).lower()
+        assert "project" in mock_callback.answer.call_args.args[0].lower()
 
     async def test_rejects_unknown_project(
         self,
         mock_callback: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
     ) -> None:
         """Shows alert when user's project is not found in config."""
 
         mock_callback.data = "fetch:file.md"
-        context = UserContext(user_id=12345, current_project="unknownproject")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="unknownproject")
 
         await handle_fetch_callback(mock_callback, telegram_config, AsyncMock(), state_store)
 
         mock_callback.answer.assert_called_once()
-        assert "not found" in str(mock_callback.answer.call_args).lower()
+        assert "not found" in mock_callback.answer.call_args.args[0].lower()
 
     async def test_rejects_path_outside_project(
         self,
         mock_callback: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
         mock_bot: AsyncMock,
     ) -> None:
         """Shows alert when path escapes project boundary."""
 
         mock_callback.data = "fetch:../../../etc/passwd"
-        context = UserContext(user_id=12345, current_project="testproject")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="testproject")
 
         await handle_fetch_callback(mock_callback, telegram_config, mock_bot, state_store)
 
         mock_callback.answer.assert_called()
-        assert "denied" in str(mock_callback.answer.call_args).lower()
+        assert "denied" in mock_callback.answer.call_args.args[0].lower()
 
     async def test_rejects_nonexistent_file(
         self,
         mock_callback: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
         mock_bot: AsyncMock,
     ) -> None:
         """Shows alert when file does not exist."""
 
         mock_callback.data = "fetch:nonexistent.md"
-        context = UserContext(user_id=12345, current_project="testproject")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="testproject")
 
         await handle_fetch_callback(mock_callback, telegram_config, mock_bot, state_store)
 
         mock_callback.answer.assert_called()
-        assert "not found" in str(mock_callback.answer.call_args).lower()
+        assert "not found" in mock_callback.answer.call_args.args[0].lower()
 
     async def test_rejects_oversized_file(
         self,
         mock_callback: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
         mock_bot: AsyncMock,
     ) -> None:
         """Shows alert when file exceeds size limit."""
 
         mock_callback.data = "fetch:large.md"
-        context = UserContext(user_id=12345, current_project="testproject")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="testproject")
 
         # Create large file
         project_path = telegram_config.projects[0].path
@@ -2788,7 +2827,7 @@ class TestHandleFetchCallback:
             await handle_fetch_callback(mock_callback, telegram_config, mock_bot, state_store)
 
             mock_callback.answer.assert_called()
-            assert "large" in str(mock_callback.answer.call_args).lower()
+            assert "large" in mock_callback.answer.call_args.args[0].lower()
         finally:
             large_file.unlink()
 
@@ -2796,14 +2835,14 @@ class TestHandleFetchCallback:
         self,
         mock_callback: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
         mock_bot: AsyncMock,
     ) -> None:
         """Sends file and acknowledges success."""
 
         mock_callback.data = "fetch:download_me.md"
-        context = UserContext(user_id=12345, current_project="testproject")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="testproject")
 
         # Create file to download
         project_path = telegram_config.projects[0].path
@@ -2817,7 +2856,7 @@ class TestHandleFetchCallback:
             mock_bot.send_document.assert_called_once()
             # Should acknowledge
             mock_callback.answer.assert_called()
-            assert "sent" in str(mock_callback.answer.call_args).lower()
+            assert "sent" in mock_callback.answer.call_args.args[0].lower()
         finally:
             test_file.unlink()
 
@@ -2825,14 +2864,14 @@ class TestHandleFetchCallback:
         self,
         mock_callback: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
         mock_bot: AsyncMock,
     ) -> None:
         """Sends file from subdirectory."""
 
         mock_callback.data = "fetch:subdir/nested.md"
-        context = UserContext(user_id=12345, current_project="testproject")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="testproject")
 
         # Create nested file
         project_path = telegram_config.projects[0].path
@@ -2854,14 +2893,14 @@ class TestHandleFetchCallback:
         self,
         mock_callback: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
         mock_bot: AsyncMock,
     ) -> None:
         """Shows alert when file send fails."""
 
         mock_callback.data = "fetch:fail.md"
-        context = UserContext(user_id=12345, current_project="testproject")
-        await state_store.upsert_context(context)
+        await seeded_context(current_project="testproject")
 
         # Create file
         project_path = telegram_config.projects[0].path
@@ -2875,13 +2914,12 @@ class TestHandleFetchCallback:
             await handle_fetch_callback(mock_callback, telegram_config, mock_bot, state_store)
 
             mock_callback.answer.assert_called()
-            assert "Failed" in str(mock_callback.answer.call_args)
+            assert "Failed" in mock_callback.answer.call_args.args[0]
         finally:
             test_file.unlink()
 
 
 @pytest.mark.asyncio
-@pytest.mark.unit
 class TestRunsCommand:
     """Tests for runs_command function."""
 
@@ -3034,13 +3072,13 @@ class TestRunsCommand:
         self,
         mock_message: MagicMock,
         mock_command: MagicMock,
-        state_store: StateStore,
+        empty_state_store: MagicMock,
     ) -> None:
         """Handles message with no from_user."""
         mock_message.from_user = None
         mock_command.args = None
 
-        await runs_command(mock_message, mock_command, state_store)
+        await runs_command(mock_message, mock_command, empty_state_store)
 
         response = mock_message.answer.call_args[0][0]
         assert "Unable to identify user" in response
@@ -3094,7 +3132,6 @@ class TestRunsCommand:
 
 
 @pytest.mark.asyncio
-@pytest.mark.unit
 class TestLogsCommand:
     """Tests for logs_command function."""
 
@@ -3282,13 +3319,13 @@ class TestLogsCommand:
         self,
         mock_message: MagicMock,
         mock_command: MagicMock,
-        state_store: StateStore,
+        empty_state_store: MagicMock,
     ) -> None:
         """Handles message with no from_user."""
         mock_message.from_user = None
         mock_command.args = "1"
 
-        await logs_command(mock_message, mock_command, state_store)
+        await logs_command(mock_message, mock_command, empty_state_store)
 
         response = mock_message.answer.call_args[0][0]
         assert "Unable to identify user" in response
@@ -3320,7 +3357,6 @@ class TestLogsCommand:
 
 
 @pytest.mark.asyncio
-@pytest.mark.unit
 class TestTailCommand:
     """Tests for tail_command function."""
 
@@ -3542,14 +3578,14 @@ class TestTailCommand:
         self,
         mock_message: MagicMock,
         mock_command: MagicMock,
-        state_store: StateStore,
+        empty_state_store: MagicMock,
         mock_bot: AsyncMock,
     ) -> None:
         """Handles message with no from_user."""
         mock_message.from_user = None
         mock_command.args = "1"
 
-        await tail_command(mock_message, mock_command, state_store, mock_bot)
+        await tail_command(mock_message, mock_command, empty_state_store, mock_bot)
 
         response = mock_message.answer.call_args[0][0]
         assert "Unable to identify user" in response
@@ -3587,7 +3623,6 @@ class TestTailCommand:
 
 
 @pytest.mark.asyncio
-@pytest.mark.unit
 class TestStatusWithRunId:
     """Tests for status_command with run_id argument."""
 
@@ -3783,7 +3818,6 @@ class TestStatusWithRunId:
 
 
 @pytest.mark.asyncio
-@pytest.mark.unit
 class TestLsCommand:
     """Tests for ls_command function."""
 
@@ -3791,13 +3825,13 @@ class TestLsCommand:
         self,
         mock_message: MagicMock,
         mock_command: MagicMock,
-        state_store: StateStore,
+        empty_state_store: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
         """Requires user to select a project first."""
         mock_command.args = ""
 
-        await ls_command(mock_message, mock_command, state_store, telegram_config)
+        await ls_command(mock_message, mock_command, empty_state_store, telegram_config)
 
         response = mock_message.answer.call_args[0][0]
         assert "No project selected" in response
@@ -3807,14 +3841,14 @@ class TestLsCommand:
         self,
         mock_message: MagicMock,
         mock_command: MagicMock,
-        state_store: StateStore,
+        empty_state_store: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
         """Handles message with no from_user."""
         mock_message.from_user = None
         mock_command.args = ""
 
-        await ls_command(mock_message, mock_command, state_store, telegram_config)
+        await ls_command(mock_message, mock_command, empty_state_store, telegram_config)
 
         response = mock_message.answer.call_args[0][0]
         assert "Unable to identify user" in response
@@ -3824,14 +3858,12 @@ class TestLsCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
     ) -> None:
         """Lists project root directory by default."""
         # Set up project context
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(
-            UserContext(user_id=user_id, current_project="testproject")
-        )
+        await seeded_context(current_project="testproject")
 
         # Create test files in project directory
         project_path = telegram_config.projects[0].path
@@ -3854,13 +3886,11 @@ class TestLsCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
     ) -> None:
         """Lists specified subdirectory."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(
-            UserContext(user_id=user_id, current_project="testproject")
-        )
+        await seeded_context(current_project="testproject")
 
         project_path = telegram_config.projects[0].path
         subdir = project_path / "src"
@@ -3879,13 +3909,11 @@ class TestLsCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
     ) -> None:
         """Shows hidden files when --all flag is provided."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(
-            UserContext(user_id=user_id, current_project="testproject")
-        )
+        await seeded_context(current_project="testproject")
 
         project_path = telegram_config.projects[0].path
         (project_path / ".hidden").write_text("secret")
@@ -3904,13 +3932,11 @@ class TestLsCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
     ) -> None:
         """Hides files starting with dot by default."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(
-            UserContext(user_id=user_id, current_project="testproject")
-        )
+        await seeded_context(current_project="testproject")
 
         project_path = telegram_config.projects[0].path
         (project_path / ".hidden").write_text("secret")
@@ -3929,13 +3955,11 @@ class TestLsCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
     ) -> None:
         """Rejects paths that traverse outside project boundary."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(
-            UserContext(user_id=user_id, current_project="testproject")
-        )
+        await seeded_context(current_project="testproject")
 
         mock_command.args = "../.."
 
@@ -3949,13 +3973,11 @@ class TestLsCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
     ) -> None:
         """Reports error for non-existent paths."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(
-            UserContext(user_id=user_id, current_project="testproject")
-        )
+        await seeded_context(current_project="testproject")
 
         mock_command.args = "nonexistent"
 
@@ -3969,13 +3991,11 @@ class TestLsCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
     ) -> None:
         """Rejects listing a file (not directory)."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(
-            UserContext(user_id=user_id, current_project="testproject")
-        )
+        await seeded_context(current_project="testproject")
 
         project_path = telegram_config.projects[0].path
         (project_path / "file.txt").write_text("content")
@@ -3992,13 +4012,11 @@ class TestLsCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
     ) -> None:
         """Shows file sizes in human-readable format."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(
-            UserContext(user_id=user_id, current_project="testproject")
-        )
+        await seeded_context(current_project="testproject")
 
         project_path = telegram_config.projects[0].path
         (project_path / "small.txt").write_text("a")  # 1 byte
@@ -4016,13 +4034,11 @@ class TestLsCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
     ) -> None:
         """Reports empty directory appropriately."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(
-            UserContext(user_id=user_id, current_project="testproject")
-        )
+        await seeded_context(current_project="testproject")
 
         project_path = telegram_config.projects[0].path
         empty_dir = project_path / "empty"
@@ -4040,13 +4056,11 @@ class TestLsCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
     ) -> None:
         """Shows count of directories and files in summary."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(
-            UserContext(user_id=user_id, current_project="testproject")
-        )
+        await seeded_context(current_project="testproject")
 
         project_path = telegram_config.projects[0].path
         (project_path / "file1.txt").write_text("a")
@@ -4063,7 +4077,6 @@ class TestLsCommand:
 
 
 @pytest.mark.asyncio
-@pytest.mark.unit
 class TestTreeCommand:
     """Tests for tree_command function."""
 
@@ -4071,13 +4084,13 @@ class TestTreeCommand:
         self,
         mock_message: MagicMock,
         mock_command: MagicMock,
-        state_store: StateStore,
+        empty_state_store: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
         """Requires user to select a project first."""
         mock_command.args = ""
 
-        await tree_command(mock_message, mock_command, state_store, telegram_config)
+        await tree_command(mock_message, mock_command, empty_state_store, telegram_config)
 
         response = mock_message.answer.call_args[0][0]
         assert "No project selected" in response
@@ -4086,14 +4099,14 @@ class TestTreeCommand:
         self,
         mock_message: MagicMock,
         mock_command: MagicMock,
-        state_store: StateStore,
+        empty_state_store: MagicMock,
         telegram_config: TelegramConfig,
     ) -> None:
         """Handles message with no from_user."""
         mock_message.from_user = None
         mock_command.args = ""
 
-        await tree_command(mock_message, mock_command, state_store, telegram_config)
+        await tree_command(mock_message, mock_command, empty_state_store, telegram_config)
 
         response = mock_message.answer.call_args[0][0]
         assert "Unable to identify user" in response
@@ -4103,13 +4116,11 @@ class TestTreeCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
     ) -> None:
         """Shows tree structure from git ls-files."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(
-            UserContext(user_id=user_id, current_project="testproject")
-        )
+        await seeded_context(current_project="testproject")
 
         project_path = telegram_config.projects[0].path
         (project_path / "file.txt").write_text("content")
@@ -4134,13 +4145,11 @@ class TestTreeCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
     ) -> None:
         """Respects depth parameter to limit tree depth."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(
-            UserContext(user_id=user_id, current_project="testproject")
-        )
+        await seeded_context(current_project="testproject")
 
         mock_command.args = "2"
 
@@ -4158,13 +4167,11 @@ class TestTreeCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
     ) -> None:
         """Rejects depth values that exceed limit."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(
-            UserContext(user_id=user_id, current_project="testproject")
-        )
+        await seeded_context(current_project="testproject")
 
         mock_command.args = "15"
 
@@ -4178,13 +4185,11 @@ class TestTreeCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
     ) -> None:
         """Rejects depth value of zero."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(
-            UserContext(user_id=user_id, current_project="testproject")
-        )
+        await seeded_context(current_project="testproject")
 
         mock_command.args = "0"
 
@@ -4198,13 +4203,11 @@ class TestTreeCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
     ) -> None:
         """Rejects paths outside project boundary."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(
-            UserContext(user_id=user_id, current_project="testproject")
-        )
+        await seeded_context(current_project="testproject")
 
         mock_command.args = "../.."
 
@@ -4218,13 +4221,11 @@ class TestTreeCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
     ) -> None:
         """Reports error for non-existent paths."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(
-            UserContext(user_id=user_id, current_project="testproject")
-        )
+        await seeded_context(current_project="testproject")
 
         mock_command.args = "nonexistent"
 
@@ -4238,15 +4239,13 @@ class TestTreeCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
     ) -> None:
         """Handles git command timeout gracefully."""
         import subprocess
 
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(
-            UserContext(user_id=user_id, current_project="testproject")
-        )
+        await seeded_context(current_project="testproject")
 
         mock_command.args = ""
 
@@ -4263,13 +4262,11 @@ class TestTreeCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         telegram_config: TelegramConfig,
     ) -> None:
         """Reports when no tracked files found."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(
-            UserContext(user_id=user_id, current_project="testproject")
-        )
+        await seeded_context(current_project="testproject")
 
         # Create a file so directory isn't empty
         project_path = telegram_config.projects[0].path
@@ -4288,7 +4285,6 @@ class TestTreeCommand:
 
 
 @pytest.mark.asyncio
-@pytest.mark.unit
 class TestCatCommand:
     """Tests for cat_command function."""
 
@@ -4469,7 +4465,6 @@ class TestCatCommand:
 
 
 @pytest.mark.asyncio
-@pytest.mark.unit
 class TestCatPaginationCallback:
     """Tests for cat pagination callback handling."""
 
@@ -4590,7 +4585,6 @@ class TestCatPaginationCallback:
         remove_pagination_state("test123")
 
 
-@pytest.mark.unit
 class TestCatPaginationKeyboard:
     """Tests for cat pagination keyboard creation."""
 
@@ -4653,7 +4647,6 @@ class TestCatPaginationKeyboard:
 
 
 @pytest.mark.asyncio
-@pytest.mark.unit
 class TestHeadCommand:
     """Tests for head_command function."""
 
@@ -4883,7 +4876,6 @@ class TestHeadCommand:
         assert "Error" in response
 
 
-@pytest.mark.unit
 class TestFindCommand:
     """Tests for find_command function."""
 
@@ -4891,13 +4883,13 @@ class TestFindCommand:
         self,
         mock_message: MagicMock,
         mock_command: MagicMock,
-        state_store: StateStore,
+        empty_state_store: MagicMock,
         git_project_config: TelegramConfig,
     ) -> None:
         """Requires user to select a project first."""
         mock_command.args = "*.py"
 
-        await find_command(mock_message, mock_command, state_store, git_project_config)
+        await find_command(mock_message, mock_command, empty_state_store, git_project_config)
 
         response = mock_message.answer.call_args[0][0]
         assert "No project selected" in response
@@ -4907,14 +4899,14 @@ class TestFindCommand:
         self,
         mock_message: MagicMock,
         mock_command: MagicMock,
-        state_store: StateStore,
+        empty_state_store: MagicMock,
         git_project_config: TelegramConfig,
     ) -> None:
         """Handles message with no from_user."""
         mock_message.from_user = None
         mock_command.args = "*.py"
 
-        await find_command(mock_message, mock_command, state_store, git_project_config)
+        await find_command(mock_message, mock_command, empty_state_store, git_project_config)
 
         response = mock_message.answer.call_args[0][0]
         assert "Unable to identify user" in response
@@ -4924,11 +4916,11 @@ class TestFindCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Shows usage message when no pattern provided."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(UserContext(user_id=user_id, current_project="gitproject"))
+        await seeded_context(current_project="gitproject")
         mock_command.args = ""
 
         await find_command(mock_message, mock_command, state_store, git_project_config)
@@ -4942,11 +4934,11 @@ class TestFindCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Finds Python files matching *.py pattern."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(UserContext(user_id=user_id, current_project="gitproject"))
+        await seeded_context(current_project="gitproject")
         mock_command.args = "*.py"
 
         await find_command(mock_message, mock_command, state_store, git_project_config)
@@ -4962,11 +4954,11 @@ class TestFindCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Finds files matching test_* prefix pattern."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(UserContext(user_id=user_id, current_project="gitproject"))
+        await seeded_context(current_project="gitproject")
         mock_command.args = "test_*"
 
         await find_command(mock_message, mock_command, state_store, git_project_config)
@@ -4983,11 +4975,11 @@ class TestFindCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Does not include files matching .gitignore patterns."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(UserContext(user_id=user_id, current_project="gitproject"))
+        await seeded_context(current_project="gitproject")
         mock_command.args = "*.json"
 
         await find_command(mock_message, mock_command, state_store, git_project_config)
@@ -5002,11 +4994,11 @@ class TestFindCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Does not include *.log files per .gitignore."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(UserContext(user_id=user_id, current_project="gitproject"))
+        await seeded_context(current_project="gitproject")
         mock_command.args = "*.log"
 
         await find_command(mock_message, mock_command, state_store, git_project_config)
@@ -5020,11 +5012,11 @@ class TestFindCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Finds files recursively with **/*.py pattern."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(UserContext(user_id=user_id, current_project="gitproject"))
+        await seeded_context(current_project="gitproject")
         mock_command.args = "**/*.py"
 
         await find_command(mock_message, mock_command, state_store, git_project_config)
@@ -5040,11 +5032,11 @@ class TestFindCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Rejects patterns with path traversal attempts."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(UserContext(user_id=user_id, current_project="gitproject"))
+        await seeded_context(current_project="gitproject")
         mock_command.args = "../*.py"
 
         await find_command(mock_message, mock_command, state_store, git_project_config)
@@ -5057,11 +5049,11 @@ class TestFindCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Rejects patterns that are too long."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(UserContext(user_id=user_id, current_project="gitproject"))
+        await seeded_context(current_project="gitproject")
         mock_command.args = "a" * 250  # Exceeds 200 char limit
 
         await find_command(mock_message, mock_command, state_store, git_project_config)
@@ -5074,11 +5066,11 @@ class TestFindCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Shows count of matched files in output."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(UserContext(user_id=user_id, current_project="gitproject"))
+        await seeded_context(current_project="gitproject")
         mock_command.args = "*.py"
 
         await find_command(mock_message, mock_command, state_store, git_project_config)
@@ -5092,13 +5084,11 @@ class TestFindCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Handles when user's selected project doesn't exist."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(
-            UserContext(user_id=user_id, current_project="nonexistent")
-        )
+        await seeded_context(current_project="nonexistent")
         mock_command.args = "*.py"
 
         await find_command(mock_message, mock_command, state_store, git_project_config)
@@ -5111,11 +5101,11 @@ class TestFindCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Results are returned in sorted order."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(UserContext(user_id=user_id, current_project="gitproject"))
+        await seeded_context(current_project="gitproject")
         mock_command.args = "*.py"
 
         await find_command(mock_message, mock_command, state_store, git_project_config)
@@ -5128,7 +5118,6 @@ class TestFindCommand:
         assert main_pos < utils_pos
 
 
-@pytest.mark.unit
 class TestGrepCommand:
     """Tests for grep_command function."""
 
@@ -5136,13 +5125,13 @@ class TestGrepCommand:
         self,
         mock_message: MagicMock,
         mock_command: MagicMock,
-        state_store: StateStore,
+        empty_state_store: MagicMock,
         git_project_config: TelegramConfig,
     ) -> None:
         """Requires user to select a project first."""
         mock_command.args = "TODO"
 
-        await grep_command(mock_message, mock_command, state_store, git_project_config)
+        await grep_command(mock_message, mock_command, empty_state_store, git_project_config)
 
         response = mock_message.answer.call_args[0][0]
         assert "No project selected" in response
@@ -5152,14 +5141,14 @@ class TestGrepCommand:
         self,
         mock_message: MagicMock,
         mock_command: MagicMock,
-        state_store: StateStore,
+        empty_state_store: MagicMock,
         git_project_config: TelegramConfig,
     ) -> None:
         """Handles message with no from_user."""
         mock_message.from_user = None
         mock_command.args = "TODO"
 
-        await grep_command(mock_message, mock_command, state_store, git_project_config)
+        await grep_command(mock_message, mock_command, empty_state_store, git_project_config)
 
         response = mock_message.answer.call_args[0][0]
         assert "Unable to identify user" in response
@@ -5169,11 +5158,11 @@ class TestGrepCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Shows usage message when no pattern provided."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(UserContext(user_id=user_id, current_project="gitproject"))
+        await seeded_context(current_project="gitproject")
         mock_command.args = ""
 
         await grep_command(mock_message, mock_command, state_store, git_project_config)
@@ -5187,11 +5176,11 @@ class TestGrepCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Finds literal string in file contents."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(UserContext(user_id=user_id, current_project="gitproject"))
+        await seeded_context(current_project="gitproject")
         mock_command.args = "Hello"
 
         await grep_command(mock_message, mock_command, state_store, git_project_config)
@@ -5205,11 +5194,11 @@ class TestGrepCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Finds content matching regex pattern."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(UserContext(user_id=user_id, current_project="gitproject"))
+        await seeded_context(current_project="gitproject")
         mock_command.args = '"def .*"'
 
         await grep_command(mock_message, mock_command, state_store, git_project_config)
@@ -5222,11 +5211,11 @@ class TestGrepCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Searches only in specified path."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(UserContext(user_id=user_id, current_project="gitproject"))
+        await seeded_context(current_project="gitproject")
         mock_command.args = "def tests/"
 
         await grep_command(mock_message, mock_command, state_store, git_project_config)
@@ -5242,11 +5231,11 @@ class TestGrepCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Does not search in files matching .gitignore patterns."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(UserContext(user_id=user_id, current_project="gitproject"))
+        await seeded_context(current_project="gitproject")
         # Search for content that exists in ignored node_modules
         mock_command.args = "package"
 
@@ -5262,11 +5251,11 @@ class TestGrepCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Rejects invalid regex patterns."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(UserContext(user_id=user_id, current_project="gitproject"))
+        await seeded_context(current_project="gitproject")
         mock_command.args = "[invalid("
 
         await grep_command(mock_message, mock_command, state_store, git_project_config)
@@ -5279,11 +5268,11 @@ class TestGrepCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Rejects search paths with path traversal."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(UserContext(user_id=user_id, current_project="gitproject"))
+        await seeded_context(current_project="gitproject")
         mock_command.args = "test ../etc/"
 
         await grep_command(mock_message, mock_command, state_store, git_project_config)
@@ -5296,11 +5285,11 @@ class TestGrepCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Rejects patterns that are too long."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(UserContext(user_id=user_id, current_project="gitproject"))
+        await seeded_context(current_project="gitproject")
         mock_command.args = "a" * 550  # Exceeds 500 char limit
 
         await grep_command(mock_message, mock_command, state_store, git_project_config)
@@ -5313,11 +5302,11 @@ class TestGrepCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Shows line numbers in search results."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(UserContext(user_id=user_id, current_project="gitproject"))
+        await seeded_context(current_project="gitproject")
         mock_command.args = "def"
 
         await grep_command(mock_message, mock_command, state_store, git_project_config)
@@ -5333,11 +5322,11 @@ class TestGrepCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Shows count of matches and files in output."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(UserContext(user_id=user_id, current_project="gitproject"))
+        await seeded_context(current_project="gitproject")
         mock_command.args = "def"
 
         await grep_command(mock_message, mock_command, state_store, git_project_config)
@@ -5351,11 +5340,11 @@ class TestGrepCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Handles double-quoted patterns containing spaces."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(UserContext(user_id=user_id, current_project="gitproject"))
+        await seeded_context(current_project="gitproject")
         mock_command.args = '"Main module"'
 
         await grep_command(mock_message, mock_command, state_store, git_project_config)
@@ -5368,11 +5357,11 @@ class TestGrepCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Handles single-quoted patterns."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(UserContext(user_id=user_id, current_project="gitproject"))
+        await seeded_context(current_project="gitproject")
         mock_command.args = "'Main module'"
 
         await grep_command(mock_message, mock_command, state_store, git_project_config)
@@ -5385,11 +5374,11 @@ class TestGrepCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Reports error for unclosed quotes."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(UserContext(user_id=user_id, current_project="gitproject"))
+        await seeded_context(current_project="gitproject")
         mock_command.args = '"unclosed'
 
         await grep_command(mock_message, mock_command, state_store, git_project_config)
@@ -5402,11 +5391,11 @@ class TestGrepCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Reports error for non-existent search path."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(UserContext(user_id=user_id, current_project="gitproject"))
+        await seeded_context(current_project="gitproject")
         mock_command.args = "test nonexistent/"
 
         await grep_command(mock_message, mock_command, state_store, git_project_config)
@@ -5419,13 +5408,11 @@ class TestGrepCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Handles when user's selected project doesn't exist."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(
-            UserContext(user_id=user_id, current_project="nonexistent")
-        )
+        await seeded_context(current_project="nonexistent")
         mock_command.args = "test"
 
         await grep_command(mock_message, mock_command, state_store, git_project_config)
@@ -5438,11 +5425,11 @@ class TestGrepCommand:
         mock_message: MagicMock,
         mock_command: MagicMock,
         state_store: StateStore,
+        seeded_context: ContextSeeder,
         git_project_config: TelegramConfig,
     ) -> None:
         """Groups search results by file in output."""
-        user_id = mock_message.from_user.id
-        await state_store.upsert_context(UserContext(user_id=user_id, current_project="gitproject"))
+        await seeded_context(current_project="gitproject")
         mock_command.args = "def"
 
         await grep_command(mock_message, mock_command, state_store, git_project_config)
@@ -5455,7 +5442,6 @@ class TestGrepCommand:
 
 
 @pytest.mark.asyncio
-@pytest.mark.unit
 class TestFileCommand:
     """Tests for file_command function."""
 
@@ -1,41 +1,38 @@
 """CLI integration tests for Telegram bot commands."""
 
-from collections.abc import Coroutine
+import subprocess
+import sys
+from collections.abc import Callable
 from pathlib import Path
-from typing import Any
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
-from typer.testing import CliRunner
+import typer
+from typer.testing import CliRunner, Result
 
-from weld.cli import app
 from weld.telegram.config import (
     TelegramAuth,
     TelegramConfig,
     TelegramProject,
+    load_config,
     save_config,
 )
 
 
-def mock_asyncio_run(return_value: Any) -> Any:
-    """Create a mock for asyncio.run that properly closes coroutines.
+@pytest.fixture(scope="session")
+def app() -> typer.Typer:
+    """Import the weld CLI app on first use rather than at collection time."""
+    from weld.cli import app
 
-    This prevents 'coroutine was never awaited' warnings by closing
-    the coroutine before returning the mocked value.
-    """
-
-    def _mock_run(coro: Coroutine[Any, Any, Any]) -> Any:
-        coro.close()
-        return return_value
-
-    return _mock_run
+    return app
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def telegram_runner() -> CliRunner:
     """Create CLI test runner with isolated environment for Telegram tests.
 
-    Sets NO_COLOR for consistent output.
+    Sets NO_COLOR for consistent output. The runner only carries this env,
+    which no test mutates, so one instance is shared across the module.
     """
     return CliRunner(
         env={
@@ -46,52 +43,130 @@ def telegram_runner() -> CliRunner:
     )
 
 
+@pytest.fixture(scope="class")
+def config_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a temporary config directory shared by the tests of one class."""
+    config_dir = tmp_path_factory.mktemp("weld-cfg") / ".config" / "weld"
+    config_dir.mkdir(parents=True)
+    return config_dir
+
+
 @pytest.fixture
-def config_dir(tmp_path: Path) -> Path:
-    """Create a temporary config directory."""
-    config_path = tmp_path / ".config" / "weld"
-    config_path.mkdir(parents=True)
+def config_path(config_dir: Path, request: pytest.FixtureRequest) -> Path:
+    """Per-test config file inside the shared config directory."""
+    return config_dir / f"{request.node.name}.toml"
+
+
+@pytest.fixture(scope="module")
+def golden_config(tmp_path_factory: pytest.TempPathFactory) -> TelegramConfig:
+    """Fully configured TelegramConfig, built once and varied with model_copy.
+
+    The project path exists, so doctor reports no issues for this config.
+    """
+    return TelegramConfig(
+        bot_token="test:token",
+        auth=TelegramAuth(allowed_user_ids=[12345], allowed_usernames=["alice"]),
+        projects=[TelegramProject(name="proj1", path=tmp_path_factory.mktemp("golden"))],
+    )
+
+
+@pytest.fixture
+def telegram_env(monkeypatch: pytest.MonkeyPatch, config_path: Path) -> Path:
+    """Point the CLI at this test's config file instead of ~/.config/weld."""
+    monkeypatch.setattr("weld.telegram.config.get_config_path", lambda: config_path)
     return config_path
 
 
 @pytest.fixture
-def mock_aiogram() -> MagicMock:
-    """Mock aiogram module to satisfy dependency check."""
-    mock = MagicMock()
-    return mock
+def stub_token_validation(monkeypatch: pytest.MonkeyPatch) -> Callable[[tuple[bool, str]], None]:
+    """Return a setter that fixes the result of the CLI's token validation.
+
+    The blocking wrapper is replaced outright, so no event loop or coroutine
+    is created for these tests.
+    """
+
+    def _set(result: tuple[bool, str]) -> None:
+        monkeypatch.setattr("weld.telegram.cli._validate_token_blocking", lambda token: result)
+
+    return _set
+
 
+def install_config(
+    monkeypatch: pytest.MonkeyPatch, config_path: Path, config: TelegramConfig
+) -> None:
+    """Serve a pre-built config to the CLI without a TOML round trip.
 
-def get_output(result: object) -> str:
-    """Get combined stdout and output from result for assertion checking.
+    The file is created so the CLI's existence check passes, and load_config
+    hands back the given object instead of parsing the file.
+    """
+    config_path.touch()
+    monkeypatch.setattr("weld.telegram.config.load_config", lambda path: config)
+
+
+def subcommand_names(app: typer.Typer, path: list[str]) -> set[str]:
+    """Return the subcommand names of the group at ``path`` in the app's command tree.
 
-    Typer's CliRunner mixes stdout/stderr by default. This function
-    extracts all text output from the result for assertion checking.
+    Walks the underlying click groups directly. Rendering --help is not needed
+    to check which commands a group exposes, and Typer's Rich help is printed
+    rather than returned.
     """
-    # Use output attribute if available (combines stdout/stderr)
-    output = getattr(result, "output", None)
-    if output:
-        return output
-    # Fallback to stdout if output not available
-    return getattr(result, "stdout", "") or ""
+    group = typer.main.get_command(app)
+    assert isinstance(group, typer.core.TyperGroup)
+    ctx = group.context_class(group, info_name="weld")
+    for segment in path:
+        group = group.get_command(ctx, segment)
+        assert isinstance(group, typer.core.TyperGroup)
+        ctx = group.context_class(group, info_name=segment, parent=ctx)
+    return set(group.list_commands(ctx))
+
+
+def run_cli(
+    app: typer.Typer, argv: list[str], capsys: pytest.CaptureFixture[str]
+) -> tuple[int, str]:
+    """Run the CLI in-process through click's main() and return (exit_code, output).
+
+    standalone_mode=False makes typer.Exit come back as a return value instead
+    of SystemExit, and capsys captures what the command echoed. This skips
+    CliRunner's stream and argv isolation, which is fine for commands that only
+    print plain text.
+    """
+    exit_code = typer.main.get_command(app).main(argv, prog_name="weld", standalone_mode=False)
+    captured = capsys.readouterr()
+    return exit_code or 0, captured.out + captured.err
+
+
+# Smallest valid config file: just a bot token, no users or projects
+MINIMAL_CONFIG_TOML = 'bot_token = "test:token"\n'
+
+# Either line of the CLI's "no config yet" message identifies that failure
+MISSING_CONFIG_HINTS = ("Configuration not found", "weld telegram init")
+
+
+def output_has_any(output: str, needles: tuple[str, ...]) -> bool:
+    """Return True if any of the expected substrings appears in the output."""
+    return any(needle in output for needle in needles)
+
+
+def get_output(result: Result) -> str:
+    """Get combined stdout and stderr from a CliRunner result.
+
+    Result.output interleaves both streams on every supported click version,
+    so no fallback to stdout is needed.
+    """
+    return result.output
 
 
 @pytest.mark.cli
 class TestTelegramHelp:
     """Tests for telegram command help."""
 
-    def test_telegram_help(self, telegram_runner: CliRunner) -> None:
-        """weld telegram --help should show subcommands."""
-        result = telegram_runner.invoke(app, ["telegram", "--help"])
-        assert result.exit_code == 0
-        output = get_output(result)
-        assert "init" in output
-        assert "whoami" in output
-        assert "doctor" in output
-        assert "projects" in output
-        assert "user" in output
-        assert "serve" in output
+    def test_telegram_help(self, app: typer.Typer) -> None:
+        """weld telegram should expose its subcommands."""
+        assert {"init", "whoami", "doctor", "projects", "user", "serve"} <= subcommand_names(
+            app, ["telegram"]
+        )
 
-    def test_telegram_no_args(self, telegram_runner: CliRunner) -> None:
+    def test_telegram_no_args(self, telegram_runner: CliRunner, app: typer.Typer) -> None:
         """weld telegram with no args shows help (no_args_is_help=True)."""
         result = telegram_runner.invoke(app, ["telegram"])
         # no_args_is_help=True with typer returns exit code 0 and shows help
@@ -99,117 +174,102 @@ class TestTelegramHelp:
         output = get_output(result)
         assert "init" in output
 
+    @pytest.mark.slow
+    def test_cli_import_does_not_load_aiogram(self) -> None:
+        """Importing weld.cli must not pull in aiogram; handlers import it lazily."""
+        code = "import sys, weld.cli; sys.exit('aiogram' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+
 
 @pytest.mark.cli
+@pytest.mark.usefixtures("telegram_env")
 class TestTelegramInit:
     """Tests for weld telegram init command."""
 
-    def test_init_invalid_token_format(self, telegram_runner: CliRunner, config_dir: Path) -> None:
-        """init should fail with invalid token format."""
-        with (
-            patch(
-                "weld.telegram.config.get_config_path",
-                return_value=config_dir / "telegram.toml",
-            ),
-        ):
-            result = telegram_runner.invoke(app, ["telegram", "init", "-t", "invalid-token"])
-            assert result.exit_code == 1
-            output = get_output(result)
-            assert "Invalid token format" in output
-
-    def test_init_empty_token(self, telegram_runner: CliRunner, config_dir: Path) -> None:
-        """init should fail with empty token."""
-        with (
-            patch(
-                "weld.telegram.config.get_config_path",
-                return_value=config_dir / "telegram.toml",
-            ),
-        ):
-            result = telegram_runner.invoke(app, ["telegram", "init", "-t", "   "])
-            assert result.exit_code == 1
-            output = get_output(result)
-            assert "Token cannot be empty" in output
-
-    def test_init_token_validation_fails(
-        self, telegram_runner: CliRunner, config_dir: Path
+    @pytest.mark.parametrize(
+        ("token", "validation", "expected"),
+        [
+            ("invalid-token", None, "Invalid token format"),
+            ("   ", None, "Token cannot be empty"),
+            ("123:ABC", (False, "Invalid token: unauthorized"), "Invalid token: unauthorized"),
+        ],
+        ids=["bad-format", "empty", "rejected-by-api"],
+    )
+    def test_init_rejects_token(
+        self,
+        telegram_runner: CliRunner,
+        app: typer.Typer,
+        stub_token_validation: Callable[[tuple[bool, str]], None],
+        token: str,
+        validation: tuple[bool, str] | None,
+        expected: str,
     ) -> None:
-        """init should fail when token validation fails."""
-        with (
-            patch(
-                "weld.telegram.config.get_config_path",
-                return_value=config_dir / "telegram.toml",
-            ),
-            patch(
-                "asyncio.run",
-                side_effect=mock_asyncio_run((False, "Invalid token: unauthorized")),
-            ),
-        ):
-            result = telegram_runner.invoke(app, ["telegram", "init", "-t", "123:ABC"])
-            assert result.exit_code == 1
-            output = get_output(result)
-            # The error message can be in stdout or stderr
-            assert "Invalid token" in output or "unauthorized" in output
-
-    def test_init_success(self, telegram_runner: CliRunner, config_dir: Path) -> None:
-        """init should succeed with valid token."""
-        config_path = config_dir / "telegram.toml"
-
-        with (
-            patch("weld.telegram.config.get_config_path", return_value=config_path),
-            patch("asyncio.run", side_effect=mock_asyncio_run((True, "@testbot"))),
-        ):
-            result = telegram_runner.invoke(app, ["telegram", "init", "-t", "123:ABC"])
-            assert result.exit_code == 0
-            output = get_output(result)
-            assert "Token valid" in output
-            assert "@testbot" in output
-            assert config_path.exists()
-
-    def test_init_config_exists_without_force(
-        self, telegram_runner: CliRunner, config_dir: Path
+        """init should fail for malformed, empty, or rejected tokens."""
+        if validation is not None:
+            stub_token_validation(validation)
+        result = telegram_runner.invoke(app, ["telegram", "init", "-t", token])
+        assert result.exit_code == 1
+        assert expected in get_output(result)
+
+    def test_init_success(
+        self,
+        telegram_runner: CliRunner,
+        app: typer.Typer,
+        config_path: Path,
+        stub_token_validation: Callable[[tuple[bool, str]], None],
     ) -> None:
-        """init should fail if config exists without --force."""
-        config_path = config_dir / "telegram.toml"
-        config = TelegramConfig(bot_token="existing:token")
-        save_config(config, config_path)
-
-        with (
-            patch("weld.telegram.config.get_config_path", return_value=config_path),
-        ):
-            result = telegram_runner.invoke(app, ["telegram", "init", "-t", "new:token"])
-            assert result.exit_code == 1
-            output = get_output(result)
-            assert "already exists" in output
-            assert "--force" in output
-
-    def test_init_config_exists_with_force(
-        self, telegram_runner: CliRunner, config_dir: Path
+        """init should succeed with valid token."""
+        stub_token_validation((True, "@testbot"))
+        result = telegram_runner.invoke(app, ["telegram", "init", "-t", "123:ABC"])
+        assert result.exit_code == 0
+        output = get_output(result)
+        assert "Token valid" in output
+        assert "@testbot" in output
+        assert config_path.exists()
+
+    @pytest.mark.parametrize(
+        ("force", "validation", "expected_exit", "expected"),
+        [
+            (False, None, 1, ("already exists", "--force")),
+            (True, (True, "@newbot"), 0, ("@newbot",)),
+        ],
+        ids=["without-force", "with-force"],
+    )
+    def test_init_config_exists(
+        self,
+        telegram_runner: CliRunner,
+        app: typer.Typer,
+        config_path: Path,
+        stub_token_validation: Callable[[tuple[bool, str]], None],
+        force: bool,
+        validation: tuple[bool, str] | None,
+        expected_exit: int,
+        expected: tuple[str, ...],
     ) -> None:
-        """init should overwrite config with --force."""
-        config_path = config_dir / "telegram.toml"
-        config = TelegramConfig(bot_token="old:token")
-        save_config(config, config_path)
-
-        with (
-            patch("weld.telegram.config.get_config_path", return_value=config_path),
-            patch("asyncio.run", side_effect=mock_asyncio_run((True, "@newbot"))),
-        ):
-            result = telegram_runner.invoke(app, ["telegram", "init", "-t", "new:token", "--force"])
-            assert result.exit_code == 0
-            output = get_output(result)
-            assert "@newbot" in output
+        """init should refuse to replace an existing config unless --force is given."""
+        save_config(TelegramConfig(bot_token="old:token"), config_path)
+
+        if validation is not None:
+            stub_token_validation(validation)
+        args = ["telegram", "init", "-t", "new:token"]
+        if force:
+            args.append("--force")
+        result = telegram_runner.invoke(app, args)
+        assert result.exit_code == expected_exit
+        output = get_output(result)
+        for needle in expected:
+            assert needle in output
 
     def test_init_prompts_global_install_when_not_available(
-        self, telegram_runner: CliRunner, config_dir: Path
+        self,
+        telegram_runner: CliRunner,
+        app: typer.Typer,
+        stub_token_validation: Callable[[tuple[bool, str]], None],
     ) -> None:
         """init should prompt to install weld globally when not in PATH."""
-        config_path = config_dir / "telegram.toml"
-
-        with (
-            patch("weld.telegram.config.get_config_path", return_value=config_path),
-            patch("asyncio.run", side_effect=mock_asyncio_run((True, "@testbot"))),
-            patch("weld.telegram.cli._is_weld_globally_available", return_value=False),
-        ):
+        stub_token_validation((True, "@testbot"))
+        with patch("weld.telegram.cli._is_weld_globally_available", return_value=False):
             # Answer 'n' to the install prompt
             result = telegram_runner.invoke(app, ["telegram", "init", "-t", "123:ABC"], input="n\n")
             assert result.exit_code == 0
@@ -218,30 +278,28 @@ class TestTelegramInit:
             assert "Install weld globally" in output
 
     def test_init_skips_prompt_when_weld_available(
-        self, telegram_runner: CliRunner, config_dir: Path
+        self,
+        telegram_runner: CliRunner,
+        app: typer.Typer,
+        stub_token_validation: Callable[[tuple[bool, str]], None],
     ) -> None:
         """init should not prompt when weld is already globally available."""
-        config_path = config_dir / "telegram.toml"
-
-        with (
-            patch("weld.telegram.config.get_config_path", return_value=config_path),
-            patch("asyncio.run", side_effect=mock_asyncio_run((True, "@testbot"))),
-            patch("weld.telegram.cli._is_weld_globally_available", return_value=True),
-        ):
+        stub_token_validation((True, "@testbot"))
+        with patch("weld.telegram.cli._is_weld_globally_available", return_value=True):
             result = telegram_runner.invoke(app, ["telegram", "init", "-t", "123:ABC"])
             assert result.exit_code == 0
             output = get_output(result)
             assert "not available globally" not in output
 
     def test_init_installs_globally_when_confirmed(
-        self, telegram_runner: CliRunner, config_dir: Path
+        self,
+        telegram_runner: CliRunner,
+        app: typer.Typer,
+        stub_token_validation: Callable[[tuple[bool, str]], None],
     ) -> None:
         """init should install weld globally when user confirms."""
-        config_path = config_dir / "telegram.toml"
-
+        stub_token_validation((True, "@testbot"))
         with (
-            patch("weld.telegram.config.get_config_path", return_value=config_path),
-            patch("asyncio.run", side_effect=mock_asyncio_run((True, "@testbot"))),
             patch("weld.telegram.cli._is_weld_globally_available", return_value=False),
             patch("weld.telegram.cli._install_weld_globally", return_value=True) as mock_install,
         ):
@@ -252,239 +310,231 @@ class TestTelegramInit:
 
 
 @pytest.mark.cli
+@pytest.mark.usefixtures("telegram_env")
 class TestTelegramWhoami:
     """Tests for weld telegram whoami command."""
 
-    def test_whoami_no_config(self, telegram_runner: CliRunner, config_dir: Path) -> None:
+    def test_whoami_no_config(self, capsys: pytest.CaptureFixture[str], app: typer.Typer) -> None:
         """whoami should fail when config doesn't exist."""
-        config_path = config_dir / "telegram.toml"
-
-        with (
-            patch("weld.telegram.config.get_config_path", return_value=config_path),
-        ):
-            result = telegram_runner.invoke(app, ["telegram", "whoami"])
-            assert result.exit_code == 1
-            output = get_output(result)
-            # The error mentions running init, or mentions config not found
-            assert "weld telegram init" in output or "Configuration not found" in output
-
-    def test_whoami_no_token(self, telegram_runner: CliRunner, config_dir: Path) -> None:
+        exit_code, output = run_cli(app, ["telegram", "whoami"], capsys)
+        assert exit_code == 1
+        # The error mentions running init, or mentions config not found
+        assert output_has_any(output, MISSING_CONFIG_HINTS)
+
+    def test_whoami_no_token(
+        self,
+        capsys: pytest.CaptureFixture[str],
+        app: typer.Typer,
+        config_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        golden_config: TelegramConfig,
+    ) -> None:
         """whoami should fail when token is not set."""
-        config_path = config_dir / "telegram.toml"
-        config = TelegramConfig()  # No token
-        save_config(config, config_path)
-
-        with (
-            patch("weld.telegram.config.get_config_path", return_value=config_path),
-        ):
-            result = telegram_runner.invoke(app, ["telegram", "whoami"])
-            assert result.exit_code == 1
-            output = get_output(result)
-            # Error mentions token not set or running init
-            assert "Token not set" in output or "weld telegram init" in output
-
-    def test_whoami_invalid_token(self, telegram_runner: CliRunner, config_dir: Path) -> None:
+        config = golden_config.model_copy(update={"bot_token": None})
+        install_config(monkeypatch, config_path, config)
+
+        exit_code, output = run_cli(app, ["telegram", "whoami"], capsys)
+        assert exit_code == 1
+        # Error mentions token not set or running init
+        assert output_has_any(output, ("Token not set", "weld telegram init"))
+
+    def test_whoami_invalid_token(
+        self,
+        capsys: pytest.CaptureFixture[str],
+        app: typer.Typer,
+        config_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        stub_token_validation: Callable[[tuple[bool, str]], None],
+    ) -> None:
         """whoami should fail when token validation fails."""
-        config_path = config_dir / "telegram.toml"
         config = TelegramConfig(bot_token="invalid:token")
-        save_config(config, config_path)
-
-        with (
-            patch("weld.telegram.config.get_config_path", return_value=config_path),
-            patch(
-                "asyncio.run",
-                side_effect=mock_asyncio_run((False, "Invalid token: unauthorized")),
-            ),
-        ):
-            result = telegram_runner.invoke(app, ["telegram", "whoami"])
-            assert result.exit_code == 1
-            output = get_output(result)
-            assert "Invalid token" in output or "unauthorized" in output
-
-    def test_whoami_success(self, telegram_runner: CliRunner, config_dir: Path) -> None:
+        install_config(monkeypatch, config_path, config)
+
+        stub_token_validation((False, "Invalid token: unauthorized"))
+        exit_code, output = run_cli(app, ["telegram", "whoami"], capsys)
+        assert exit_code == 1
+        assert output_has_any(output, ("Invalid token", "unauthorized"))
+
+    def test_whoami_success(
+        self,
+        capsys: pytest.CaptureFixture[str],
+        app: typer.Typer,
+        config_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        stub_token_validation: Callable[[tuple[bool, str]], None],
+        golden_config: TelegramConfig,
+    ) -> None:
         """whoami should show bot info when authenticated."""
-        config_path = config_dir / "telegram.toml"
-        config = TelegramConfig(
-            bot_token="valid:token",
-            auth=TelegramAuth(allowed_user_ids=[12345], allowed_usernames=["alice"]),
-            projects=[TelegramProject(name="proj1", path=config_dir)],
-        )
-        save_config(config, config_path)
+        install_config(monkeypatch, config_path, golden_config)
 
-        with (
-            patch("weld.telegram.config.get_config_path", return_value=config_path),
-            patch("asyncio.run", side_effect=mock_asyncio_run((True, "@mybot"))),
-        ):
-            result = telegram_runner.invoke(app, ["telegram", "whoami"])
-            assert result.exit_code == 0
-            output = get_output(result)
-            assert "Status: Authenticated" in output
-            assert "Bot: @mybot" in output
-            assert "Allowed users: 1 IDs, 1 usernames" in output
-            assert "Projects: 1 registered" in output
+        stub_token_validation((True, "@mybot"))
+        exit_code, output = run_cli(app, ["telegram", "whoami"], capsys)
+        assert exit_code == 0
+        assert "Status: Authenticated" in output
+        assert "Bot: @mybot" in output
+        assert "Allowed users: 1 IDs, 1 usernames" in output
+        assert "Projects: 1 registered" in output
 
 
 @pytest.mark.cli
+@pytest.mark.usefixtures("telegram_env")
 class TestTelegramDoctor:
     """Tests for weld telegram doctor command."""
 
-    def test_doctor_no_config(self, telegram_runner: CliRunner, config_dir: Path) -> None:
+    def test_doctor_no_config(self, capsys: pytest.CaptureFixture[str], app: typer.Typer) -> None:
         """doctor should report missing config."""
-        config_path = config_dir / "telegram.toml"
-
-        with patch("weld.telegram.config.get_config_path", return_value=config_path):
-            result = telegram_runner.invoke(app, ["telegram", "doctor"])
-            assert result.exit_code == 1
-            output = get_output(result)
-            assert "NOT FOUND" in output
-            assert "weld telegram init" in output
+        exit_code, output = run_cli(app, ["telegram", "doctor"], capsys)
+        assert exit_code == 1
+        assert "NOT FOUND" in output
+        assert "weld telegram init" in output
 
-    def test_doctor_invalid_config(self, telegram_runner: CliRunner, config_dir: Path) -> None:
+    def test_doctor_invalid_config(
+        self, capsys: pytest.CaptureFixture[str], app: typer.Typer, config_path: Path
+    ) -> None:
         """doctor should report invalid config."""
-        config_path = config_dir / "telegram.toml"
         config_path.write_text("invalid [ toml")
 
-        with patch("weld.telegram.config.get_config_path", return_value=config_path):
-            result = telegram_runner.invoke(app, ["telegram", "doctor"])
-            assert result.exit_code == 1
-            output = get_output(result)
-            assert "INVALID" in output
-
-    def test_doctor_no_token(self, telegram_runner: CliRunner, config_dir: Path) -> None:
+        exit_code, output = run_cli(app, ["telegram", "doctor"], capsys)
+        assert exit_code == 1
+        assert "INVALID" in output
+
+    def test_doctor_no_token(
+        self,
+        capsys: pytest.CaptureFixture[str],
+        app: typer.Typer,
+        config_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        golden_config: TelegramConfig,
+    ) -> None:
         """doctor should report missing token."""
-        config_path = config_dir / "telegram.toml"
-        config = TelegramConfig()  # No token
-        save_config(config, config_path)
-
-        with patch("weld.telegram.config.get_config_path", return_value=config_path):
-            result = telegram_runner.invoke(app, ["telegram", "doctor"])
-            assert result.exit_code == 1
-            output = get_output(result)
-            assert "NOT SET" in output
-
-    def test_doctor_no_users(self, telegram_runner: CliRunner, config_dir: Path) -> None:
+        config = golden_config.model_copy(update={"bot_token": None})
+        install_config(monkeypatch, config_path, config)
+
+        exit_code, output = run_cli(app, ["telegram", "doctor"], capsys)
+        assert exit_code == 1
+        assert "NOT SET" in output
+
+    def test_doctor_no_users(
+        self,
+        capsys: pytest.CaptureFixture[str],
+        app: typer.Typer,
+        config_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        stub_token_validation: Callable[[tuple[bool, str]], None],
+        golden_config: TelegramConfig,
+    ) -> None:
         """doctor should warn about no allowed users."""
-        config_path = config_dir / "telegram.toml"
-        config = TelegramConfig(bot_token="valid:token")
-        save_config(config, config_path)
-
-        with (
-            patch("weld.telegram.config.get_config_path", return_value=config_path),
-            patch("asyncio.run", side_effect=mock_asyncio_run((True, "@mybot"))),
-        ):
-            result = telegram_runner.invoke(app, ["telegram", "doctor"])
-            # Exit 0 because warnings don't cause failure
-            assert result.exit_code == 0
-            output = get_output(result)
-            assert "No allowed users" in output
-
-    def test_doctor_no_projects(self, telegram_runner: CliRunner, config_dir: Path) -> None:
+        config = golden_config.model_copy(update={"auth": TelegramAuth()})
+        install_config(monkeypatch, config_path, config)
+
+        stub_token_validation((True, "@mybot"))
+        exit_code, output = run_cli(app, ["telegram", "doctor"], capsys)
+        # Exit 0 because warnings don't cause failure
+        assert exit_code == 0
+        assert "No allowed users" in output
+
+    def test_doctor_no_projects(
+        self,
+        capsys: pytest.CaptureFixture[str],
+        app: typer.Typer,
+        config_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        stub_token_validation: Callable[[tuple[bool, str]], None],
+        golden_config: TelegramConfig,
+    ) -> None:
         """doctor should warn about no projects."""
-        config_path = config_dir / "telegram.toml"
-        config = TelegramConfig(
-            bot_token="valid:token",
-            auth=TelegramAuth(allowed_user_ids=[12345]),
-        )
-        save_config(config, config_path)
+        config = golden_config.model_copy(update={"projects": []})
+        install_config(monkeypatch, config_path, config)
 
-        with (
-            patch("weld.telegram.config.get_config_path", return_value=config_path),
-            patch("asyncio.run", side_effect=mock_asyncio_run((True, "@mybot"))),
-        ):
-            result = telegram_runner.invoke(app, ["telegram", "doctor"])
-            assert result.exit_code == 0
-            output = get_output(result)
-            assert "No projects registered" in output
+        stub_token_validation((True, "@mybot"))
+        exit_code, output = run_cli(app, ["telegram", "doctor"], capsys)
+        assert exit_code == 0
+        assert "No projects registered" in output
 
     def test_doctor_project_path_not_exists(
-        self, telegram_runner: CliRunner, config_dir: Path
+        self,
+        capsys: pytest.CaptureFixture[str],
+        app: typer.Typer,
+        config_dir: Path,
+        config_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        stub_token_validation: Callable[[tuple[bool, str]], None],
     ) -> None:
         """doctor should warn about non-existent project paths."""
-        config_path = config_dir / "telegram.toml"
         config = TelegramConfig(
             bot_token="valid:token",
             auth=TelegramAuth(allowed_user_ids=[12345]),
             projects=[TelegramProject(name="missing", path=config_dir / "nonexistent")],
         )
-        save_config(config, config_path)
+        install_config(monkeypatch, config_path, config)
 
-        with (
-            patch("weld.telegram.config.get_config_path", return_value=config_path),
-            patch("asyncio.run", side_effect=mock_asyncio_run((True, "@mybot"))),
-        ):
-            result = telegram_runner.invoke(app, ["telegram", "doctor"])
-            assert result.exit_code == 0
-            output = get_output(result)
-            assert "does not exist" in output
+        stub_token_validation((True, "@mybot"))
+        exit_code, output = run_cli(app, ["telegram", "doctor"], capsys)
+        assert exit_code == 0
+        assert "does not exist" in output
 
     def test_doctor_all_checks_pass(
-        self, telegram_runner: CliRunner, config_dir: Path, tmp_path: Path
+        self,
+        capsys: pytest.CaptureFixture[str],
+        app: typer.Typer,
+        config_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        stub_token_validation: Callable[[tuple[bool, str]], None],
+        golden_config: TelegramConfig,
     ) -> None:
         """doctor should pass when everything is configured correctly."""
-        config_path = config_dir / "telegram.toml"
-        project_dir = tmp_path / "myproject"
-        project_dir.mkdir()
+        install_config(monkeypatch, config_path, golden_config)
 
-        config = TelegramConfig(
-            bot_token="valid:token",
-            auth=TelegramAuth(allowed_user_ids=[12345]),
-            projects=[TelegramProject(name="myproject", path=project_dir)],
-        )
-        save_config(config, config_path)
-
-        with (
-            patch("weld.telegram.config.get_config_path", return_value=config_path),
-            patch("asyncio.run", side_effect=mock_asyncio_run((True, "@mybot"))),
-        ):
-            result = telegram_runner.invoke(app, ["telegram", "doctor"])
-            assert result.exit_code == 0
-            output = get_output(result)
-            assert "All checks passed" in output
+        stub_token_validation((True, "@mybot"))
+        exit_code, output = run_cli(app, ["telegram", "doctor"], capsys)
+        assert exit_code == 0
+        assert "All checks passed" in output
 
 
 @pytest.mark.cli
+@pytest.mark.usefixtures("telegram_env")
 class TestTelegramProjects:
     """Tests for weld telegram projects subcommands."""
 
-    def test_projects_help(self, telegram_runner: CliRunner) -> None:
-        """weld telegram projects --help should show subcommands."""
-        result = telegram_runner.invoke(app, ["telegram", "projects", "--help"])
-        assert result.exit_code == 0
-        output = get_output(result)
-        assert "add" in output
-        assert "remove" in output
-        assert "list" in output
+    def test_projects_help(self, app: typer.Typer) -> None:
+        """weld telegram projects should expose add, remove and list."""
+        assert subcommand_names(app, ["telegram", "projects"]) == {"add", "remove", "list"}
 
-    def test_projects_list_no_config(self, telegram_runner: CliRunner, config_dir: Path) -> None:
+    def test_projects_list_no_config(self, telegram_runner: CliRunner, app: typer.Typer) -> None:
         """projects list should fail when config doesn't exist."""
-        config_path = config_dir / "telegram.toml"
-
-        with patch("weld.telegram.config.get_config_path", return_value=config_path):
-            result = telegram_runner.invoke(app, ["telegram", "projects", "list"])
-            assert result.exit_code == 1
-            output = get_output(result)
-            # Error mentions config not found or running init
-            assert "Configuration not found" in output or "weld telegram init" in output
-
-    def test_projects_list_empty(self, telegram_runner: CliRunner, config_dir: Path) -> None:
+        result = telegram_runner.invoke(app, ["telegram", "projects", "list"])
+        assert result.exit_code == 1
+        output = get_output(result)
+        # Error mentions config not found or running init
+        assert output_has_any(output, MISSING_CONFIG_HINTS)
+
+    def test_projects_list_empty(
+        self,
+        telegram_runner: CliRunner,
+        app: typer.Typer,
+        config_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        golden_config: TelegramConfig,
+    ) -> None:
         """projects list should show message when no projects."""
-        config_path = config_dir / "telegram.toml"
-        config = TelegramConfig(bot_token="test:token")
-        save_config(config, config_path)
+        config = golden_config.model_copy(update={"projects": []})
+        install_config(monkeypatch, config_path, config)
 
-        with patch("weld.telegram.config.get_config_path", return_value=config_path):
-            result = telegram_runner.invoke(app, ["telegram", "projects", "list"])
-            assert result.exit_code == 0
-            output = get_output(result)
-            assert "No projects registered" in output
+        result = telegram_runner.invoke(app, ["telegram", "projects", "list"])
+        assert result.exit_code == 0
+        output = get_output(result)
+        assert "No projects registered" in output
 
     def test_projects_list_with_projects(
-        self, telegram_runner: CliRunner, config_dir: Path, tmp_path: Path
+        self,
+        telegram_runner: CliRunner,
+        app: typer.Typer,
+        config_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """projects list should show all registered projects."""
-        config_path = config_dir / "telegram.toml"
-        project_dir = tmp_path / "myproject"
-        project_dir.mkdir()
+        # projects list only echoes the configured path, so it need not exist
+        project_dir = Path("/nonexistent/myproject")
 
         config = TelegramConfig(
             bot_token="test:token",
@@ -492,56 +542,64 @@ class TestTelegramProjects:
                 TelegramProject(name="myproject", path=project_dir, description="Test project")
             ],
         )
-        save_config(config, config_path)
+        install_config(monkeypatch, config_path, config)
 
-        with patch("weld.telegram.config.get_config_path", return_value=config_path):
-            result = telegram_runner.invoke(app, ["telegram", "projects", "list"])
-            assert result.exit_code == 0
-            output = get_output(result)
-            assert "myproject" in output
-            assert str(project_dir) in output
-            assert "Test project" in output
+        result = telegram_runner.invoke(app, ["telegram", "projects", "list"])
+        assert result.exit_code == 0
+        output = get_output(result)
+        assert "myproject" in output
+        assert str(project_dir) in output
+        assert "Test project" in output
 
     def test_projects_add_path_not_exists(
-        self, telegram_runner: CliRunner, config_dir: Path
+        self,
+        telegram_runner: CliRunner,
+        app: typer.Typer,
+        config_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """projects add should fail when path doesn't exist."""
-        config_path = config_dir / "telegram.toml"
         config = TelegramConfig(bot_token="test:token")
-        save_config(config, config_path)
+        install_config(monkeypatch, config_path, config)
 
-        with patch("weld.telegram.config.get_config_path", return_value=config_path):
-            result = telegram_runner.invoke(
-                app, ["telegram", "projects", "add", "newproj", "/nonexistent/path"]
-            )
-            assert result.exit_code == 1
-            output = get_output(result)
-            assert "does not exist" in output
+        result = telegram_runner.invoke(
+            app, ["telegram", "projects", "add", "newproj", "/nonexistent/path"]
+        )
+        assert result.exit_code == 1
+        output = get_output(result)
+        assert "does not exist" in output
 
     def test_projects_add_path_not_directory(
-        self, telegram_runner: CliRunner, config_dir: Path, tmp_path: Path
+        self,
+        telegram_runner: CliRunner,
+        app: typer.Typer,
+        config_path: Path,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """projects add should fail when path is not a directory."""
-        config_path = config_dir / "telegram.toml"
         config = TelegramConfig(bot_token="test:token")
-        save_config(config, config_path)
+        install_config(monkeypatch, config_path, config)
 
         file_path = tmp_path / "afile.txt"
         file_path.write_text("content")
 
-        with patch("weld.telegram.config.get_config_path", return_value=config_path):
-            result = telegram_runner.invoke(
-                app, ["telegram", "projects", "add", "newproj", str(file_path)]
-            )
-            assert result.exit_code == 1
-            output = get_output(result)
-            assert "not a directory" in output
+        result = telegram_runner.invoke(
+            app, ["telegram", "projects", "add", "newproj", str(file_path)]
+        )
+        assert result.exit_code == 1
+        output = get_output(result)
+        assert "not a directory" in output
 
     def test_projects_add_duplicate_name(
-        self, telegram_runner: CliRunner, config_dir: Path, tmp_path: Path
+        self,
+        telegram_runner: CliRunner,
+        app: typer.Typer,
+        config_path: Path,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """projects add should fail when project name already exists."""
-        config_path = config_dir / "telegram.toml"
         project_dir = tmp_path / "existing"
         project_dir.mkdir()
         new_dir = tmp_path / "new"
@@ -551,71 +609,68 @@ class TestTelegramProjects:
             bot_token="test:token",
             projects=[TelegramProject(name="myproj", path=project_dir)],
         )
-        save_config(config, config_path)
+        install_config(monkeypatch, config_path, config)
 
-        with patch("weld.telegram.config.get_config_path", return_value=config_path):
-            result = telegram_runner.invoke(
-                app, ["telegram", "projects", "add", "myproj", str(new_dir)]
-            )
-            assert result.exit_code == 1
-            output = get_output(result)
-            assert "already exists" in output
+        result = telegram_runner.invoke(
+            app, ["telegram", "projects", "add", "myproj", str(new_dir)]
+        )
+        assert result.exit_code == 1
+        output = get_output(result)
+        assert "already exists" in output
 
     def test_projects_add_success(
-        self, telegram_runner: CliRunner, config_dir: Path, tmp_path: Path
+        self, telegram_runner: CliRunner, app: typer.Typer, config_path: Path, tmp_path: Path
     ) -> None:
         """projects add should succeed with valid inputs."""
-        config_path = config_dir / "telegram.toml"
-        config = TelegramConfig(bot_token="test:token")
-        save_config(config, config_path)
+        config_path.write_text(MINIMAL_CONFIG_TOML)
 
         project_dir = tmp_path / "myproject"
         project_dir.mkdir()
 
-        with patch("weld.telegram.config.get_config_path", return_value=config_path):
-            result = telegram_runner.invoke(
-                app,
-                [
-                    "telegram",
-                    "projects",
-                    "add",
-                    "myproject",
-                    str(project_dir),
-                    "-d",
-                    "My test project",
-                ],
-            )
-            assert result.exit_code == 0
-            output = get_output(result)
-            assert "Added project" in output
-            assert "myproject" in output
+        result = telegram_runner.invoke(
+            app,
+            [
+                "telegram",
+                "projects",
+                "add",
+                "myproject",
+                str(project_dir),
+                "-d",
+                "My test project",
+            ],
+        )
+        assert result.exit_code == 0
+        output = get_output(result)
+        assert "Added project" in output
+        assert "myproject" in output
 
         # Verify project was persisted
-        from weld.telegram.config import load_config
-
         loaded = load_config(config_path)
         assert len(loaded.projects) == 1
         assert loaded.projects[0].name == "myproject"
         assert loaded.projects[0].description == "My test project"
 
-    def test_projects_remove_not_found(self, telegram_runner: CliRunner, config_dir: Path) -> None:
+    def test_projects_remove_not_found(
+        self,
+        telegram_runner: CliRunner,
+        app: typer.Typer,
+        config_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
         """projects remove should fail when project doesn't exist."""
-        config_path = config_dir / "telegram.toml"
         config = TelegramConfig(bot_token="test:token")
-        save_config(config, config_path)
+        install_config(monkeypatch, config_path, config)
 
-        with patch("weld.telegram.config.get_config_path", return_value=config_path):
-            result = telegram_runner.invoke(app, ["telegram", "projects", "remove", "nonexistent"])
-            assert result.exit_code == 1
-            output = get_output(result)
-            # Error mentions not found or suggests listing projects
-            assert "not found" in output or "projects list" in output
+        result = telegram_runner.invoke(app, ["telegram", "projects", "remove", "nonexistent"])
+        assert result.exit_code == 1
+        output = get_output(result)
+        # Error mentions not found or suggests listing projects
+        assert output_has_any(output, ("not found", "projects list"))
 
     def test_projects_remove_success(
-        self, telegram_runner: CliRunner, config_dir: Path, tmp_path: Path
+        self, telegram_runner: CliRunner, app: typer.Typer, config_path: Path, tmp_path: Path
     ) -> None:
         """projects remove should successfully remove project."""
-        config_path = config_dir / "telegram.toml"
         project_dir = tmp_path / "myproject"
         project_dir.mkdir()
 
@@ -625,287 +680,276 @@ class TestTelegramProjects:
         )
         save_config(config, config_path)
 
-        with patch("weld.telegram.config.get_config_path", return_value=config_path):
-            result = telegram_runner.invoke(app, ["telegram", "projects", "remove", "myproject"])
-            assert result.exit_code == 0
-            output = get_output(result)
-            assert "Removed project" in output
+        result = telegram_runner.invoke(app, ["telegram", "projects", "remove", "myproject"])
+        assert result.exit_code == 0
+        output = get_output(result)
+        assert "Removed project" in output
 
         # Verify project was removed
-        from weld.telegram.config import load_config
-
         loaded = load_config(config_path)
         assert len(loaded.projects) == 0
 
 
 @pytest.mark.cli
+@pytest.mark.usefixtures("telegram_env")
 class TestEnvironmentIsolation:
     """Tests to verify environment variable isolation between tests."""
 
-    def test_config_path_isolation_a(self, telegram_runner: CliRunner, config_dir: Path) -> None:
-        """First test in pair - sets up config in temp dir A."""
-        config_path = config_dir / "telegram.toml"
-        config = TelegramConfig(
-            bot_token="test:token_a",
-            auth=TelegramAuth(allowed_user_ids=[111]),
-        )
-        save_config(config, config_path)
-
-        with (
-            patch("weld.telegram.config.get_config_path", return_value=config_path),
-            patch("asyncio.run", side_effect=mock_asyncio_run((True, "@bot_a"))),
-        ):
-            result = telegram_runner.invoke(app, ["telegram", "whoami"])
-            assert result.exit_code == 0
-            output = get_output(result)
-            assert "@bot_a" in output
-            assert "1 IDs" in output
-
-    def test_config_path_isolation_b(self, telegram_runner: CliRunner, config_dir: Path) -> None:
-        """Second test in pair - sets up different config in temp dir B."""
-        config_path = config_dir / "telegram.toml"
-        config = TelegramConfig(
-            bot_token="test:token_b",
-            auth=TelegramAuth(allowed_user_ids=[222, 333]),
-        )
-        save_config(config, config_path)
+    @pytest.mark.parametrize(
+        ("token", "user_ids", "bot_name", "expected_ids"),
+        [
+            ("test:token_a", [111], "@bot_a", "1 IDs"),
+            ("test:token_b", [222, 333], "@bot_b", "2 IDs"),
+        ],
+        ids=["a", "b"],
+    )
+    def test_config_path_isolation(
+        self,
+        telegram_runner: CliRunner,
+        app: typer.Typer,
+        config_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        stub_token_validation: Callable[[tuple[bool, str]], None],
+        token: str,
+        user_ids: list[int],
+        bot_name: str,
+        expected_ids: str,
+    ) -> None:
+        """Each case sees only its own config file, never the other case's."""
+        config = TelegramConfig(bot_token=token, auth=TelegramAuth(allowed_user_ids=user_ids))
+        install_config(monkeypatch, config_path, config)
 
-        with (
-            patch("weld.telegram.config.get_config_path", return_value=config_path),
-            patch("asyncio.run", side_effect=mock_asyncio_run((True, "@bot_b"))),
-        ):
-            result = telegram_runner.invoke(app, ["telegram", "whoami"])
-            assert result.exit_code == 0
-            output = get_output(result)
-            assert "@bot_b" in output
-            assert "2 IDs" in output
+        stub_token_validation((True, bot_name))
+        result = telegram_runner.invoke(app, ["telegram", "whoami"])
+        assert result.exit_code == 0
+        output = get_output(result)
+        assert bot_name in output
+        assert expected_ids in output
 
-    def test_no_real_home_dir_access(self, telegram_runner: CliRunner, config_dir: Path) -> None:
+    def test_no_real_home_dir_access(
+        self, telegram_runner: CliRunner, app: typer.Typer, config_path: Path
+    ) -> None:
         """Verify tests don't access real home directory config."""
         # This test verifies that our mocking of get_config_path
         # prevents tests from accessing the real ~/.config/weld/telegram.toml
-        config_path = config_dir / "telegram.toml"
 
         # Config doesn't exist in our temp dir
         assert not config_path.exists()
 
-        with patch("weld.telegram.config.get_config_path", return_value=config_path):
-            result = telegram_runner.invoke(app, ["telegram", "projects", "list"])
-            # Should fail because config doesn't exist in temp dir
-            assert result.exit_code == 1
-            output = get_output(result)
-            # Error mentions config not found or running init
-            assert "Configuration not found" in output or "weld telegram init" in output
+        result = telegram_runner.invoke(app, ["telegram", "projects", "list"])
+        # Should fail because config doesn't exist in temp dir
+        assert result.exit_code == 1
+        output = get_output(result)
+        # Error mentions config not found or running init
+        assert output_has_any(output, MISSING_CONFIG_HINTS)
 
 
 @pytest.mark.cli
+@pytest.mark.usefixtures("telegram_env")
 class TestTelegramUser:
     """Tests for weld telegram user subcommands."""
 
-    def test_user_help(self, telegram_runner: CliRunner) -> None:
-        """weld telegram user --help should show subcommands."""
-        result = telegram_runner.invoke(app, ["telegram", "user", "--help"])
-        assert result.exit_code == 0
-        output = get_output(result)
-        assert "add" in output
-        assert "remove" in output
-        assert "list" in output
+    def test_user_help(self, app: typer.Typer) -> None:
+        """weld telegram user should expose add, remove and list."""
+        assert subcommand_names(app, ["telegram", "user"]) == {"add", "remove", "list"}
 
-    def test_user_list_no_config(self, telegram_runner: CliRunner, config_dir: Path) -> None:
+    def test_user_list_no_config(self, telegram_runner: CliRunner, app: typer.Typer) -> None:
         """user list should fail when config doesn't exist."""
-        config_path = config_dir / "telegram.toml"
-
-        with patch("weld.telegram.config.get_config_path", return_value=config_path):
-            result = telegram_runner.invoke(app, ["telegram", "user", "list"])
-            assert result.exit_code == 1
-            output = get_output(result)
-            assert "Configuration not found" in output or "weld telegram init" in output
-
-    def test_user_list_empty(self, telegram_runner: CliRunner, config_dir: Path) -> None:
+        result = telegram_runner.invoke(app, ["telegram", "user", "list"])
+        assert result.exit_code == 1
+        output = get_output(result)
+        assert output_has_any(output, MISSING_CONFIG_HINTS)
+
+    def test_user_list_empty(
+        self,
+        telegram_runner: CliRunner,
+        app: typer.Typer,
+        config_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
         """user list should show message when no users."""
-        config_path = config_dir / "telegram.toml"
         config = TelegramConfig(bot_token="test:token")
-        save_config(config, config_path)
+        install_config(monkeypatch, config_path, config)
 
-        with patch("weld.telegram.config.get_config_path", return_value=config_path):
-            result = telegram_runner.invoke(app, ["telegram", "user", "list"])
-            assert result.exit_code == 0
-            output = get_output(result)
-            assert "No users in allowlist" in output
-
-    def test_user_list_with_users(self, telegram_runner: CliRunner, config_dir: Path) -> None:
+        result = telegram_runner.invoke(app, ["telegram", "user", "list"])
+        assert result.exit_code == 0
+        output = get_output(result)
+        assert "No users in allowlist" in output
+
+    def test_user_list_with_users(
+        self,
+        telegram_runner: CliRunner,
+        app: typer.Typer,
+        config_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
         """user list should show all allowed users."""
-        config_path = config_dir / "telegram.toml"
         config = TelegramConfig(
             bot_token="test:token",
             auth=TelegramAuth(allowed_user_ids=[12345, 67890], allowed_usernames=["alice", "bob"]),
         )
-        save_config(config, config_path)
+        install_config(monkeypatch, config_path, config)
 
-        with patch("weld.telegram.config.get_config_path", return_value=config_path):
-            result = telegram_runner.invoke(app, ["telegram", "user", "list"])
-            assert result.exit_code == 0
-            output = get_output(result)
-            assert "12345" in output
-            assert "67890" in output
-            assert "@alice" in output
-            assert "@bob" in output
+        result = telegram_runner.invoke(app, ["telegram", "user", "list"])
+        assert result.exit_code == 0
+        output = get_output(result)
+        assert "12345" in output
+        assert "67890" in output
+        assert "@alice" in output
+        assert "@bob" in output
 
-    def test_user_add_by_id(self, telegram_runner: CliRunner, config_dir: Path) -> None:
+    def test_user_add_by_id(
+        self, telegram_runner: CliRunner, app: typer.Typer, config_path: Path
+    ) -> None:
         """user add should add user by numeric ID."""
-        config_path = config_dir / "telegram.toml"
-        config = TelegramConfig(bot_token="test:token")
-        save_config(config, config_path)
+        config_path.write_text(MINIMAL_CONFIG_TOML)
 
-        with patch("weld.telegram.config.get_config_path", return_value=config_path):
-            result = telegram_runner.invoke(app, ["telegram", "user", "add", "12345"])
-            assert result.exit_code == 0
-            output = get_output(result)
-            assert "Added user ID 12345" in output
+        result = telegram_runner.invoke(app, ["telegram", "user", "add", "12345"])
+        assert result.exit_code == 0
+        output = get_output(result)
+        assert "Added user ID 12345" in output
 
         # Verify user was persisted
-        from weld.telegram.config import load_config
-
         loaded = load_config(config_path)
         assert 12345 in loaded.auth.allowed_user_ids
 
-    def test_user_add_by_username(self, telegram_runner: CliRunner, config_dir: Path) -> None:
+    def test_user_add_by_username(
+        self, telegram_runner: CliRunner, app: typer.Typer, config_path: Path
+    ) -> None:
         """user add should add user by username."""
-        config_path = config_dir / "telegram.toml"
-        config = TelegramConfig(bot_token="test:token")
-        save_config(config, config_path)
+        config_path.write_text(MINIMAL_CONFIG_TOML)
 
-        with patch("weld.telegram.config.get_config_path", return_value=config_path):
-            result = telegram_runner.invoke(app, ["telegram", "user", "add", "alice"])
-            assert result.exit_code == 0
-            output = get_output(result)
-            assert "Added username 'alice'" in output
+        result = telegram_runner.invoke(app, ["telegram", "user", "add", "alice"])
+        assert result.exit_code == 0
+        output = get_output(result)
+        assert "Added username 'alice'" in output
 
         # Verify user was persisted
-        from weld.telegram.config import load_config
-
         loaded = load_config(config_path)
         assert "alice" in loaded.auth.allowed_usernames
 
-    def test_user_add_strips_at_prefix(self, telegram_runner: CliRunner, config_dir: Path) -> None:
+    def test_user_add_strips_at_prefix(
+        self, telegram_runner: CliRunner, app: typer.Typer, config_path: Path
+    ) -> None:
         """user add should strip @ prefix from usernames."""
-        config_path = config_dir / "telegram.toml"
-        config = TelegramConfig(bot_token="test:token")
-        save_config(config, config_path)
+        config_path.write_text(MINIMAL_CONFIG_TOML)
 
-        with patch("weld.telegram.config.get_config_path", return_value=config_path):
-            result = telegram_runner.invoke(app, ["telegram", "user", "add", "@alice"])
-            assert result.exit_code == 0
-            output = get_output(result)
-            assert "Added username 'alice'" in output
+        result = telegram_runner.invoke(app, ["telegram", "user", "add", "@alice"])
+        assert result.exit_code == 0
+        output = get_output(result)
+        assert "Added username 'alice'" in output
 
         # Verify username stored without @
-        from weld.telegram.config import load_config
-
         loaded = load_config(config_path)
         assert "alice" in loaded.auth.allowed_usernames
         assert "@alice" not in loaded.auth.allowed_usernames
 
-    def test_user_add_duplicate_id(self, telegram_runner: CliRunner, config_dir: Path) -> None:
+    def test_user_add_duplicate_id(
+        self,
+        telegram_runner: CliRunner,
+        app: typer.Typer,
+        config_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
         """user add should not add duplicate user ID."""
-        config_path = config_dir / "telegram.toml"
         config = TelegramConfig(
             bot_token="test:token",
             auth=TelegramAuth(allowed_user_ids=[12345]),
         )
-        save_config(config, config_path)
+        install_config(monkeypatch, config_path, config)
 
-        with patch("weld.telegram.config.get_config_path", return_value=config_path):
-            result = telegram_runner.invoke(app, ["telegram", "user", "add", "12345"])
-            assert result.exit_code == 0
-            output = get_output(result)
-            assert "already in the allowlist" in output
+        result = telegram_runner.invoke(app, ["telegram", "user", "add", "12345"])
+        assert result.exit_code == 0
+        output = get_output(result)
+        assert "already in the allowlist" in output
 
     def test_user_add_duplicate_username(
-        self, telegram_runner: CliRunner, config_dir: Path
+        self,
+        telegram_runner: CliRunner,
+        app: typer.Typer,
+        config_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """user add should not add duplicate username."""
-        config_path = config_dir / "telegram.toml"
         config = TelegramConfig(
             bot_token="test:token",
             auth=TelegramAuth(allowed_usernames=["alice"]),
         )
-        save_config(config, config_path)
+        install_config(monkeypatch, config_path, config)
 
-        with patch("weld.telegram.config.get_config_path", return_value=config_path):
-            result = telegram_runner.invoke(app, ["telegram", "user", "add", "alice"])
-            assert result.exit_code == 0
-            output = get_output(result)
-            assert "already in the allowlist" in output
+        result = telegram_runner.invoke(app, ["telegram", "user", "add", "alice"])
+        assert result.exit_code == 0
+        output = get_output(result)
+        assert "already in the allowlist" in output
 
-    def test_user_remove_id_success(self, telegram_runner: CliRunner, config_dir: Path) -> None:
+    def test_user_remove_id_success(
+        self, telegram_runner: CliRunner, app: typer.Typer, config_path: Path
+    ) -> None:
         """user remove should remove user by ID."""
-        config_path = config_dir / "telegram.toml"
         config = TelegramConfig(
             bot_token="test:token",
             auth=TelegramAuth(allowed_user_ids=[12345, 67890]),
         )
         save_config(config, config_path)
 
-        with patch("weld.telegram.config.get_config_path", return_value=config_path):
-            result = telegram_runner.invoke(app, ["telegram", "user", "remove", "12345"])
-            assert result.exit_code == 0
-            output = get_output(result)
-            assert "Removed user ID 12345" in output
+        result = telegram_runner.invoke(app, ["telegram", "user", "remove", "12345"])
+        assert result.exit_code == 0
+        output = get_output(result)
+        assert "Removed user ID 12345" in output
 
         # Verify user was removed
-        from weld.telegram.config import load_config
-
         loaded = load_config(config_path)
         assert 12345 not in loaded.auth.allowed_user_ids
         assert 67890 in loaded.auth.allowed_user_ids
 
     def test_user_remove_username_success(
-        self, telegram_runner: CliRunner, config_dir: Path
+        self, telegram_runner: CliRunner, app: typer.Typer, config_path: Path
     ) -> None:
         """user remove should remove user by username."""
-        config_path = config_dir / "telegram.toml"
         config = TelegramConfig(
             bot_token="test:token",
             auth=TelegramAuth(allowed_usernames=["alice", "bob"]),
         )
         save_config(config, config_path)
 
-        with patch("weld.telegram.config.get_config_path", return_value=config_path):
-            result = telegram_runner.invoke(app, ["telegram", "user", "remove", "alice"])
-            assert result.exit_code == 0
-            output = get_output(result)
-            assert "Removed username 'alice'" in output
+        result = telegram_runner.invoke(app, ["telegram", "user", "remove", "alice"])
+        assert result.exit_code == 0
+        output = get_output(result)
+        assert "Removed username 'alice'" in output
 
         # Verify user was removed
-        from weld.telegram.config import load_config
-
         loaded = load_config(config_path)
         assert "alice" not in loaded.auth.allowed_usernames
         assert "bob" in loaded.auth.allowed_usernames
 
-    def test_user_remove_id_not_found(self, telegram_runner: CliRunner, config_dir: Path) -> None:
+    def test_user_remove_id_not_found(
+        self,
+        telegram_runner: CliRunner,
+        app: typer.Typer,
+        config_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
         """user remove should fail when user ID not found."""
-        config_path = config_dir / "telegram.toml"
         config = TelegramConfig(bot_token="test:token")
-        save_config(config, config_path)
+        install_config(monkeypatch, config_path, config)
 
-        with patch("weld.telegram.config.get_config_path", return_value=config_path):
-            result = telegram_runner.invoke(app, ["telegram", "user", "remove", "99999"])
-            assert result.exit_code == 1
-            output = get_output(result)
-            assert "not found" in output
+        result = telegram_runner.invoke(app, ["telegram", "user", "remove", "99999"])
+        assert result.exit_code == 1
+        output = get_output(result)
+        assert "not found" in output
 
     def test_user_remove_username_not_found(
-        self, telegram_runner: CliRunner, config_dir: Path
+        self,
+        telegram_runner: CliRunner,
+        app: typer.Typer,
+        config_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """user remove should fail when username not found."""
-        config_path = config_dir / "telegram.toml"
         config = TelegramConfig(bot_token="test:token")
-        save_config(config, config_path)
+        install_config(monkeypatch, config_path, config)
 
-        with patch("weld.telegram.config.get_config_path", return_value=config_path):
-            result = telegram_runner.invoke(app, ["telegram", "user", "remove", "nobody"])
-            assert result.exit_code == 1
-            output = get_output(result)
-            assert "not found" in output
+        result = telegram_runner.invoke(app, ["telegram", "user", "remove", "nobody"])
+        assert result.exit_code == 1
+        output = get_output(result)
+        assert "not found" in output
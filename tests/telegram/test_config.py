@@ -39,6 +39,23 @@ class TestTelegramProject:
         project = TelegramProject(name="test", path=tmp_path, description="Test project")
         assert project.description == "Test project"
 
+    def test_resolved_path_follows_symlinks(self, tmp_path: Path) -> None:
+        """resolved_path resolves symlinks in the project path."""
+        target = tmp_path / "real"
+        target.mkdir()
+        link = tmp_path / "link"
+        link.symlink_to(target)
+        project = TelegramProject(name="test", path=link)
+        assert project.resolved_path == target.resolve()
+        assert project.path == link
+
+    def test_resolved_path_not_serialized(self, tmp_path: Path) -> None:
+        """Cached resolved_path does not leak into dumps or equality."""
+        project = TelegramProject(name="test", path=tmp_path)
+        _ = project.resolved_path
+        assert "resolved_path" not in project.model_dump()
+        assert project == TelegramProject(name="test", path=tmp_path)
+
     def test_name_required(self, tmp_path: Path) -> None:
         """Project name is required."""
         with pytest.raises(ValidationError):
@@ -1,6 +1,8 @@
 """Tests for Telegram bot file path validation."""
 
 import os
+import shutil
+from collections.abc import Callable
 from pathlib import Path
 
 import pytest
@@ -17,10 +19,10 @@ from weld.telegram.files import (
 )
 
 
-@pytest.fixture
-def project_dir(tmp_path: Path) -> Path:
-    """Create a project directory with some files."""
-    project = tmp_path / "myproject"
+@pytest.fixture(scope="session")
+def _project_skeleton(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Build the read-only project tree once per session."""
+    project = tmp_path_factory.mktemp("skeleton") / "myproject"
     project.mkdir()
     (project / "src").mkdir()
     (project / "src" / "main.py").write_text("print('hello')")
@@ -28,6 +30,18 @@ def project_dir(tmp_path: Path) -> Path:
     return project
 
 
+@pytest.fixture
+def project_dir(tmp_path: Path, _project_skeleton: Path) -> Path:
+    """Create a project directory with some files.
+
+    Files are hardlinked from the session skeleton, so tests must replace
+    rather than rewrite them in place.
+    """
+    project = tmp_path / "myproject"
+    shutil.copytree(_project_skeleton, project, copy_function=os.link)
+    return project
+
+
 @pytest.fixture
 def config_with_project(project_dir: Path) -> TelegramConfig:
     """Create a config with the test project registered."""
@@ -62,35 +76,6 @@ class TestValidateFetchPath:
         with pytest.raises(PathNotFoundError, match="does not exist"):
             validate_fetch_path(file_path, config_with_project)
 
-    def test_raises_when_no_projects_registered(self, project_dir: Path) -> None:
-        """validate_fetch_path raises PathNotAllowedError when no projects configured."""
-        config = TelegramConfig()
-        file_path = project_dir / "README.md"
-        with pytest.raises(PathNotAllowedError, match="No projects registered"):
-            validate_fetch_path(file_path, config)
-
-    def test_raises_when_path_outside_project(
-        self, tmp_path: Path, config_with_project: TelegramConfig
-    ) -> None:
-        """validate_fetch_path raises PathNotAllowedError for paths outside project."""
-        outside_file = tmp_path / "outside.txt"
-        outside_file.write_text("outside content")
-        with pytest.raises(PathNotAllowedError, match="not within any registered project"):
-            validate_fetch_path(outside_file, config_with_project)
-
-    def test_raises_for_traversal_attempt(
-        self, project_dir: Path, tmp_path: Path, config_with_project: TelegramConfig
-    ) -> None:
-        """validate_fetch_path raises for path traversal attempts."""
-        # Create a file outside the project
-        outside_file = tmp_path / "secret.txt"
-        outside_file.write_text("secret data")
-
-        # Try to access it via traversal
-        traversal_path = project_dir / ".." / "secret.txt"
-        with pytest.raises(PathNotAllowedError, match="not within any registered project"):
-            validate_fetch_path(traversal_path, config_with_project)
-
     def test_symlink_within_project_allowed(
         self, project_dir: Path, config_with_project: TelegramConfig
     ) -> None:
@@ -167,29 +152,6 @@ class TestValidatePushPath:
         result = validate_push_path(new_file, config_with_project)
         assert result == new_file.resolve()
 
-    def test_raises_when_no_projects_registered(self, project_dir: Path) -> None:
-        """validate_push_path raises PathNotAllowedError when no projects configured."""
-        config = TelegramConfig()
-        file_path = project_dir / "newfile.py"
-        with pytest.raises(PathNotAllowedError, match="No projects registered"):
-            validate_push_path(file_path, config)
-
-    def test_raises_when_path_outside_project(
-        self, tmp_path: Path, config_with_project: TelegramConfig
-    ) -> None:
-        """validate_push_path raises PathNotAllowedError for paths outside project."""
-        outside_file = tmp_path / "outside.txt"
-        with pytest.raises(PathNotAllowedError, match="not within any registered project"):
-            validate_push_path(outside_file, config_with_project)
-
-    def test_raises_for_traversal_attempt(
-        self, project_dir: Path, config_with_project: TelegramConfig
-    ) -> None:
-        """validate_push_path raises for path traversal attempts."""
-        traversal_path = project_dir / ".." / "escaped.txt"
-        with pytest.raises(PathNotAllowedError, match="not within any registered project"):
-            validate_push_path(traversal_path, config_with_project)
-
     def test_symlink_dir_escaping_rejected(
         self, project_dir: Path, tmp_path: Path, config_with_project: TelegramConfig
     ) -> None:
@@ -207,6 +169,18 @@ class TestValidatePushPath:
         with pytest.raises(PathNotAllowedError, match="not within any registered project"):
             validate_push_path(escaped_path, config_with_project)
 
+    def test_dangling_symlink_escaping_rejected(
+        self, project_dir: Path, tmp_path: Path, config_with_project: TelegramConfig
+    ) -> None:
+        """validate_push_path rejects a dangling symlink whose target is outside."""
+        # Writing through the link would create the file outside the project
+        outside_target = tmp_path / "outside_new.txt"
+        link = project_dir / "innocent_file"
+        link.symlink_to(outside_target)
+
+        with pytest.raises(PathNotAllowedError, match="not within any registered project"):
+            validate_push_path(link, config_with_project)
+
     def test_accepts_string_path(
         self, project_dir: Path, config_with_project: TelegramConfig
     ) -> None:
@@ -230,6 +204,62 @@ class TestValidatePushPath:
 class TestPathValidationEdgeCases:
     """Edge case tests for path validation."""
 
+    @pytest.mark.parametrize("validator", [validate_fetch_path, validate_push_path])
+    def test_raises_when_no_projects_registered(
+        self, validator: Callable[[Path, TelegramConfig], Path], project_dir: Path
+    ) -> None:
+        """Both validators raise PathNotAllowedError when no projects configured."""
+        with pytest.raises(PathNotAllowedError, match="No projects registered"):
+            validator(project_dir / "README.md", TelegramConfig())
+
+    @pytest.mark.parametrize(
+        ("validator", "create_target"),
+        [
+            (validate_fetch_path, True),
+            (validate_push_path, True),
+            (validate_push_path, False),
+        ],
+    )
+    def test_raises_when_path_outside_project(
+        self,
+        validator: Callable[[Path, TelegramConfig], Path],
+        create_target: bool,
+        tmp_path: Path,
+        config_with_project: TelegramConfig,
+    ) -> None:
+        """Both validators raise PathNotAllowedError for paths outside project."""
+        outside_file = tmp_path / "outside.txt"
+        if create_target:
+            outside_file.write_text("outside content")
+        with pytest.raises(PathNotAllowedError, match="not within any registered project"):
+            validator(outside_file, config_with_project)
+
+    @pytest.mark.parametrize(
+        ("validator", "create_target"),
+        [
+            (validate_fetch_path, True),
+            (validate_push_path, True),
+            (validate_push_path, False),
+        ],
+    )
+    def test_raises_for_traversal_attempt(
+        self,
+        validator: Callable[[Path, TelegramConfig], Path],
+        create_target: bool,
+        project_dir: Path,
+        tmp_path: Path,
+        config_with_project: TelegramConfig,
+    ) -> None:
+        """Both validators reject traversal out of the project."""
+        outside_file = tmp_path / "secret.txt"
+        if create_target:
+            outside_file.write_text("secret data")
+
+        # Try to reach it via traversal
+        traversal_path = project_dir / ".." / "secret.txt"
+        with pytest.raises(PathNotAllowedError, match="not within any registered project"):
+            validator(traversal_path, config_with_project)
+
     def test_relative_path_converted_to_absolute(
         self,
         project_dir: Path,
@@ -277,6 +307,22 @@ class TestPathValidationEdgeCases:
         assert "proj1" in error_msg or str(proj1) in error_msg
         assert "proj2" in error_msg or str(proj2) in error_msg
 
+    @pytest.mark.parametrize("name", ["foo\x00bar", "src/main.py\x00"])
+    def test_fetch_null_byte_raises_not_found(
+        self, name: str, project_dir: Path, config_with_project: TelegramConfig
+    ) -> None:
+        """validate_fetch_path maps an embedded NUL byte to PathNotFoundError."""
+        with pytest.raises(PathNotFoundError, match="does not exist"):
+            validate_fetch_path(f"{project_dir}/{name}", config_with_project)
+
+    @pytest.mark.parametrize("name", ["foo\x00bar", "missing\x00/new.txt"])
+    def test_push_null_byte_rejected(
+        self, name: str, project_dir: Path, config_with_project: TelegramConfig
+    ) -> None:
+        """validate_push_path rejects an embedded NUL byte with PathNotAllowedError."""
+        with pytest.raises(PathNotAllowedError, match="Invalid path"):
+            validate_push_path(f"{project_dir}/{name}", config_with_project)
+
     @pytest.mark.skipif(os.name == "nt", reason="Symlinks require elevated privileges on Windows")
     def test_circular_symlink_handled(
         self, project_dir: Path, config_with_project: TelegramConfig
@@ -1,7 +1,13 @@
 """Tests for Telegram bot async subprocess runner."""
 
 import asyncio
-from unittest.mock import MagicMock, patch
+import os
+import signal
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -20,6 +26,63 @@ from weld.telegram.runner import (
 )
 
 
+class _FakeProc:
+    """Lightweight stand-in for asyncio.subprocess.Process in registry tests."""
+
+    __slots__ = ("ignores_sigterm", "kill_calls", "pid", "returncode", "terminate_calls")
+
+    def __init__(self, returncode: int | None = None, *, ignores_sigterm: bool = False) -> None:
+        self.returncode = returncode
+        self.pid = 12345
+        self.ignores_sigterm = ignores_sigterm
+        self.terminate_calls = 0
+        self.kill_calls = 0
+
+    def terminate(self) -> None:
+        self.terminate_calls += 1
+
+    def kill(self) -> None:
+        self.kill_calls += 1
+
+    async def wait(self) -> int:
+        if self.ignores_sigterm and not self.kill_calls:
+            # Outlast the patched shutdown timeout so wait_for cancels us
+            await asyncio.sleep(0.1)
+        self.returncode = -9 if self.kill_calls else 0
+        return self.returncode
+
+
+def _register(run_id: int, proc: Any, queue: asyncio.Queue[str] | None = None) -> None:
+    """Register a fake process in the active runs registry."""
+    _active_runs[run_id] = (proc, queue if queue is not None else asyncio.Queue())
+
+
+CREATE_SUBPROCESS = "weld.telegram.runner.asyncio.create_subprocess_exec"
+
+
+def _make_proc(
+    stdout_chunks: Sequence[bytes] = (),
+    stderr_chunks: Sequence[bytes] = (),
+    returncode: int = 0,
+) -> AsyncMock:
+    """Build a spec'd subprocess mock whose pipes yield the given chunks, then EOF."""
+    proc = AsyncMock(spec=asyncio.subprocess.Process)
+    proc.pid = 12345
+    proc.returncode = None
+    proc.stdin = None
+    proc.stdout = AsyncMock(spec=asyncio.StreamReader)
+    proc.stdout.read.side_effect = [*stdout_chunks, b""]
+    proc.stderr = AsyncMock(spec=asyncio.StreamReader)
+    proc.stderr.read.side_effect = [*stderr_chunks, b""]
+
+    async def wait() -> int:
+        proc.returncode = returncode
+        return returncode
+
+    proc.wait.side_effect = wait
+    return proc
+
+
 @pytest.fixture(autouse=True)
 def clear_active_runs():
     """Clear the active runs registry before and after each test."""
@@ -40,95 +103,113 @@ class TestCancelRun:
 
     async def test_cancel_already_terminated_returns_false(self) -> None:
         """cancel_run returns False when process already terminated."""
-        # Create a mock process that appears already terminated
-        mock_proc = MagicMock()
-        mock_proc.returncode = 0  # Already exited
-        mock_proc.pid = 12345
-
-        _active_runs[1] = (mock_proc, asyncio.Queue())
+        proc = _FakeProc(returncode=0)  # Already exited
+        _register(1, proc)
 
         result = await cancel_run(1)
         assert result is False
+        assert proc.terminate_calls == 0
         # Should have been cleaned up
         assert 1 not in _active_runs
 
     async def test_cancel_graceful_termination(self) -> None:
         """cancel_run sends SIGTERM and waits for graceful exit."""
-        mock_proc = MagicMock()
-        mock_proc.returncode = None  # Still running
-        mock_proc.pid = 12345
-        mock_proc.terminate = MagicMock()
-        mock_proc.kill = MagicMock()
+        proc = _FakeProc()  # Still running, exits on SIGTERM
+        _register(1, proc)
 
-        # wait() returns quickly (graceful shutdown)
-        async def mock_wait():
-            mock_proc.returncode = 0
+        result = await cancel_run(1)
 
-        mock_proc.wait = mock_wait
+        assert result is True
+        assert proc.terminate_calls == 1
+        assert proc.kill_calls == 0
+        assert 1 not in _active_runs
 
-        _active_runs[1] = (mock_proc, asyncio.Queue())
+    async def test_cancel_force_kill_after_timeout(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """cancel_run sends SIGKILL if process doesn't exit after SIGTERM."""
+        monkeypatch.setattr("weld.telegram.runner.GRACEFUL_SHUTDOWN_TIMEOUT", 0.01)
+        proc = _FakeProc(ignores_sigterm=True)
+        _register(1, proc)
 
         result = await cancel_run(1)
 
         assert result is True
-        mock_proc.terminate.assert_called_once()
-        mock_proc.kill.assert_not_called()
+        assert proc.terminate_calls == 1
+        assert proc.kill_calls == 1
+        assert proc.returncode == -9
         assert 1 not in _active_runs
 
-    @pytest.mark.slow
-    async def test_cancel_force_kill_after_timeout(self) -> None:
-        """cancel_run sends SIGKILL if process doesn't exit after SIGTERM."""
-        mock_proc = MagicMock()
-        mock_proc.returncode = None  # Still running
-        mock_proc.pid = 12345
-        mock_proc.terminate = MagicMock()
-        mock_proc.kill = MagicMock()
+    async def test_cancel_removes_from_registry(self) -> None:
+        """cancel_run removes the run from _active_runs."""
+        _register(1, _FakeProc())
+        _register(2, _FakeProc())  # Another run that shouldn't be affected
 
-        kill_called = False
+        await cancel_run(1)
 
-        async def mock_wait():
-            nonlocal kill_called
-            if not kill_called:
-                # First call (after terminate) - never complete, will be cancelled by wait_for
-                await asyncio.sleep(GRACEFUL_SHUTDOWN_TIMEOUT + 10)
-            # After kill, complete immediately
-            mock_proc.returncode = -9
+        assert 1 not in _active_runs
+        assert 2 in _active_runs  # Other run should still be there
 
-        def mock_kill():
-            nonlocal kill_called
-            kill_called = True
 
-        mock_proc.wait = mock_wait
-        mock_proc.kill = mock_kill
+# Child that ignores SIGTERM and reports readiness once the handler is installed
+_SIGTERM_IGNORING_CHILD = (
+    "import signal, time\n"
+    "signal.signal(signal.SIGTERM, signal.SIG_IGN)\n"
+    "print('ready', flush=True)\n"
+    "time.sleep(60)\n"
+)
+
 
-        _active_runs[1] = (mock_proc, asyncio.Queue())
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.skipif(os.name == "nt", reason="Relies on POSIX signals")
+class TestRealProcess:
+    """cancel_run and execute_run against real child processes."""
+
+    async def test_cancel_force_kills_process_ignoring_sigterm(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """cancel_run escalates to SIGKILL when a real child ignores SIGTERM."""
+        monkeypatch.setattr("weld.telegram.runner.GRACEFUL_SHUTDOWN_TIMEOUT", 0.2)
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", _SIGTERM_IGNORING_CHILD, stdout=asyncio.subprocess.PIPE
+        )
+        assert proc.stdout is not None
+        assert await proc.stdout.readline() == b"ready\n"
+        _register(1, proc)
 
         result = await cancel_run(1)
 
         assert result is True
-        mock_proc.terminate.assert_called_once()
-        assert kill_called  # kill was called
+        assert proc.returncode == -signal.SIGKILL
         assert 1 not in _active_runs
 
-    async def test_cancel_removes_from_registry(self) -> None:
-        """cancel_run removes the run from _active_runs."""
-        mock_proc = MagicMock()
-        mock_proc.returncode = None
-        mock_proc.pid = 12345
-        mock_proc.terminate = MagicMock()
+    async def test_execute_run_timeout_terminates_child(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """execute_run stops a real long-running command when its timeout fires."""
+        fake_weld = tmp_path / "weld"
+        fake_weld.write_text(f"#!{sys.executable}\nimport time\ntime.sleep(60)\n")
+        fake_weld.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
 
-        async def mock_wait():
-            mock_proc.returncode = 0
+        # Pass-through spawn that keeps a handle on the real child
+        spawned: list[asyncio.subprocess.Process] = []
+        real_spawn = asyncio.create_subprocess_exec
 
-        mock_proc.wait = mock_wait
+        async def spawn_and_capture(*args: Any, **kwargs: Any) -> asyncio.subprocess.Process:
+            proc = await real_spawn(*args, **kwargs)
+            spawned.append(proc)
+            return proc
 
-        _active_runs[1] = (mock_proc, asyncio.Queue())
-        _active_runs[2] = (MagicMock(), asyncio.Queue())  # Another run that shouldn't be affected
+        monkeypatch.setattr(CREATE_SUBPROCESS, spawn_and_capture)
 
-        await cancel_run(1)
+        with pytest.raises(TelegramRunError, match="timed out"):
+            async for _ in execute_run(1, "plan", timeout=0.2):
+                pass
 
+        assert len(spawned) == 1
+        # The child was stopped and reaped, not left sleeping
+        assert spawned[0].returncode is not None
         assert 1 not in _active_runs
-        assert 2 in _active_runs  # Other run should still be there
 
 
 @pytest.mark.asyncio
@@ -169,307 +250,112 @@ class TestExecuteRun:
 
     async def test_execute_run_with_echo_command(self) -> None:
         """execute_run can run a command and capture stdout."""
-        with patch("weld.telegram.runner.asyncio.create_subprocess_exec") as mock_create_subprocess:
-            # Create a mock process
-            mock_proc = MagicMock()
-            mock_proc.pid = 12345
-            mock_proc.returncode = None
-
-            # Create mock streams
-            stdout_content = b"Hello, World!\n"
-            mock_stdout = MagicMock()
-            read_count = 0
-
-            async def mock_stdout_read(size: int) -> bytes:
-                nonlocal read_count
-                if read_count == 0:
-                    read_count += 1
-                    return stdout_content
-                return b""
-
-            mock_stdout.read = mock_stdout_read
-
-            mock_stderr = MagicMock()
-
-            async def mock_stderr_read(size: int) -> bytes:
-                return b""
-
-            mock_stderr.read = mock_stderr_read
-
-            mock_proc.stdout = mock_stdout
-            mock_proc.stderr = mock_stderr
-
-            async def mock_wait() -> int:
-                mock_proc.returncode = 0
-                return 0
-
-            mock_proc.wait = mock_wait
-
-            async def create_proc(*args, **kwargs):
-                return mock_proc
-
-            mock_create_subprocess.side_effect = create_proc
-
+        proc = _make_proc(stdout_chunks=[b"Hello, World!\n"])
+        with patch(CREATE_SUBPROCESS, return_value=proc):
             # Collect output
             output_chunks: list[tuple[str, str]] = []
             async for chunk_type, data in execute_run(1, "echo", ["Hello"]):
                 output_chunks.append((chunk_type, data))
 
-            # Verify we got stdout output matching our mock
-            assert len(output_chunks) > 0
-            stdout_chunks = [(t, d) for t, d in output_chunks if t == "stdout"]
-            assert len(stdout_chunks) > 0
-            assert any("Hello, World!" in data for _, data in stdout_chunks)
-            # Run should be cleaned up
-            assert 1 not in _active_runs
+        # Verify we got stdout output matching our mock
+        stdout_chunks = [(t, d) for t, d in output_chunks if t == "stdout"]
+        assert any("Hello, World!" in data for _, data in stdout_chunks)
+        # Run should be cleaned up
+        assert 1 not in _active_runs
 
     async def test_execute_run_registers_and_unregisters_process(self) -> None:
         """execute_run registers process in _active_runs and cleans up after."""
-        with patch("weld.telegram.runner.asyncio.create_subprocess_exec") as mock_create_subprocess:
-            mock_proc = MagicMock()
-            mock_proc.pid = 12345
-            mock_proc.returncode = None
-
-            # Empty streams that immediately report EOF
-            mock_stdout = MagicMock()
-
-            async def mock_stdout_read(size: int) -> bytes:
-                return b""
-
-            mock_stdout.read = mock_stdout_read
-
-            mock_stderr = MagicMock()
-
-            async def mock_stderr_read(size: int) -> bytes:
-                return b""
-
-            mock_stderr.read = mock_stderr_read
-
-            mock_proc.stdout = mock_stdout
-            mock_proc.stderr = mock_stderr
-
-            registered_during_run = False
-
-            async def mock_wait() -> int:
-                nonlocal registered_during_run
-                # Check if registered during execution
-                registered_during_run = 1 in _active_runs
-                mock_proc.returncode = 0
-                return 0
-
-            mock_proc.wait = mock_wait
+        proc = _make_proc()
+        registered_during_run = False
 
-            async def create_proc(*args, **kwargs):
-                return mock_proc
+        async def wait() -> int:
+            nonlocal registered_during_run
+            # Check if registered during execution
+            registered_during_run = 1 in _active_runs
+            proc.returncode = 0
+            return 0
 
-            mock_create_subprocess.side_effect = create_proc
+        proc.wait.side_effect = wait
 
+        with patch(CREATE_SUBPROCESS, return_value=proc):
             async for _ in execute_run(1, "test"):
                 pass
 
-            assert registered_during_run
-            assert 1 not in _active_runs
+        assert registered_during_run
+        assert 1 not in _active_runs
 
     async def test_execute_run_raises_on_nonzero_exit(self) -> None:
         """execute_run raises TelegramRunError on non-zero exit code."""
-        with patch("weld.telegram.runner.asyncio.create_subprocess_exec") as mock_create_subprocess:
-            mock_proc = MagicMock()
-            mock_proc.pid = 12345
-            mock_proc.returncode = None
-
-            mock_stdout = MagicMock()
-
-            async def mock_stdout_read(size: int) -> bytes:
-                return b""
-
-            mock_stdout.read = mock_stdout_read
-
-            mock_stderr = MagicMock()
-
-            async def mock_stderr_read(size: int) -> bytes:
-                return b""
-
-            mock_stderr.read = mock_stderr_read
-
-            mock_proc.stdout = mock_stdout
-            mock_proc.stderr = mock_stderr
-
-            async def mock_wait() -> int:
-                mock_proc.returncode = 1
-                return 1
-
-            mock_proc.wait = mock_wait
-
-            async def create_proc(*args, **kwargs):
-                return mock_proc
-
-            mock_create_subprocess.side_effect = create_proc
-
-            with pytest.raises(TelegramRunError) as exc_info:
-                async for _ in execute_run(1, "failing-command"):
-                    pass
+        with (
+            patch(CREATE_SUBPROCESS, return_value=_make_proc(returncode=1)),
+            pytest.raises(TelegramRunError) as exc_info,
+        ):
+            async for _ in execute_run(1, "failing-command"):
+                pass
 
-            assert "exit code 1" in str(exc_info.value)
+        assert "exit code 1" in str(exc_info.value)
 
     async def test_execute_run_raises_on_command_not_found(self) -> None:
         """execute_run raises TelegramRunError when command not found."""
-        with patch("weld.telegram.runner.asyncio.create_subprocess_exec") as mock_create_subprocess:
-            mock_create_subprocess.side_effect = FileNotFoundError()
-
-            with pytest.raises(TelegramRunError) as exc_info:
-                async for _ in execute_run(1, "nonexistent"):
-                    pass
+        with (
+            patch(CREATE_SUBPROCESS, side_effect=FileNotFoundError()),
+            pytest.raises(TelegramRunError) as exc_info,
+        ):
+            async for _ in execute_run(1, "nonexistent"):
+                pass
 
-            assert "not found" in str(exc_info.value)
+        assert "not found" in str(exc_info.value)
 
-    @pytest.mark.slow
     async def test_execute_run_timeout(self) -> None:
         """execute_run raises TelegramRunError on timeout."""
-        with patch("weld.telegram.runner.asyncio.create_subprocess_exec") as mock_create_subprocess:
-            mock_proc = MagicMock()
-            mock_proc.pid = 12345
-            mock_proc.returncode = None
-
-            # Streams that simulate slow reads - wait_for wraps them,
-            # so we need to actually delay. Using small delay with short timeout.
-            mock_stdout = MagicMock()
-
-            async def mock_stdout_read(size: int) -> bytes:
-                # Delay longer than the overall timeout to trigger timeout check
-                await asyncio.sleep(0.2)
-                return b""
-
-            mock_stdout.read = mock_stdout_read
-
-            mock_stderr = MagicMock()
-
-            async def mock_stderr_read(size: int) -> bytes:
-                await asyncio.sleep(0.2)
-                return b""
-
-            mock_stderr.read = mock_stderr_read
-
-            mock_proc.stdout = mock_stdout
-            mock_proc.stderr = mock_stderr
-            mock_proc.terminate = MagicMock()
-            mock_proc.kill = MagicMock()
-
-            async def mock_wait() -> int:
-                mock_proc.returncode = -15
-                return -15
-
-            mock_proc.wait = mock_wait
-
-            async def create_proc(*args, **kwargs):
-                return mock_proc
-
-            mock_create_subprocess.side_effect = create_proc
-
-            # Short timeout (0.1s) with reads that take 0.2s each
-            # After first read timeout check, elapsed >= timeout triggers
-            with pytest.raises(TelegramRunError) as exc_info:
-                async for _ in execute_run(1, "slow-command", timeout=0.1):
-                    pass
+        proc = _make_proc(returncode=-15)
+
+        async def slow_read(size: int) -> bytes:
+            # Delay longer than the overall timeout to trigger timeout check
+            await asyncio.sleep(0.2)
+            return b""
+
+        proc.stdout.read.side_effect = slow_read
+        proc.stderr.read.side_effect = slow_read
+
+        # Short timeout (0.1s) with reads that take 0.2s each
+        with (
+            patch(CREATE_SUBPROCESS, return_value=proc),
+            pytest.raises(TelegramRunError) as exc_info,
+        ):
+            async for _ in execute_run(1, "slow-command", timeout=0.1):
+                pass
 
-            assert "timed out" in str(exc_info.value).lower()
+        assert "timed out" in str(exc_info.value).lower()
+        proc.terminate.assert_called_once()
 
     async def test_execute_run_handles_cancellation(self) -> None:
         """execute_run handles asyncio.CancelledError properly."""
-        with patch("weld.telegram.runner.asyncio.create_subprocess_exec") as mock_create_subprocess:
-            mock_proc = MagicMock()
-            mock_proc.pid = 12345
-            mock_proc.returncode = None
-            mock_proc.terminate = MagicMock()
-            mock_proc.kill = MagicMock()
+        proc = _make_proc(returncode=-15)
+        # Raise CancelledError to simulate task cancellation
+        proc.stdout.read.side_effect = asyncio.CancelledError()
+        proc.stderr.read.side_effect = asyncio.CancelledError()
 
-            mock_stdout = MagicMock()
-
-            async def mock_read_cancelled(size: int) -> bytes:
-                # Raise CancelledError to simulate task cancellation
-                raise asyncio.CancelledError()
-
-            mock_stdout.read = mock_read_cancelled
-
-            mock_stderr = MagicMock()
-
-            async def mock_stderr_read_cancelled(size: int) -> bytes:
-                raise asyncio.CancelledError()
-
-            mock_stderr.read = mock_stderr_read_cancelled
-
-            mock_proc.stdout = mock_stdout
-            mock_proc.stderr = mock_stderr
-
-            async def mock_wait() -> int:
-                mock_proc.returncode = -15
-                return -15
-
-            mock_proc.wait = mock_wait
-
-            async def create_proc(*args, **kwargs):
-                return mock_proc
-
-            mock_create_subprocess.side_effect = create_proc
-
-            with pytest.raises(asyncio.CancelledError):
-                async for _ in execute_run(1, "cancelled-command"):
-                    pass
+        with patch(CREATE_SUBPROCESS, return_value=proc), pytest.raises(asyncio.CancelledError):
+            async for _ in execute_run(1, "cancelled-command"):
+                pass
 
-            # Process should have been terminated
-            mock_proc.terminate.assert_called()
-            # Run should be cleaned up from registry
-            assert 1 not in _active_runs
+        # Process should have been terminated
+        proc.terminate.assert_called()
+        # Run should be cleaned up from registry
+        assert 1 not in _active_runs
 
     async def test_execute_run_captures_stderr(self) -> None:
         """execute_run captures stderr output separately."""
-        with patch("weld.telegram.runner.asyncio.create_subprocess_exec") as mock_create_subprocess:
-            mock_proc = MagicMock()
-            mock_proc.pid = 12345
-            mock_proc.returncode = None
-
-            # Stdout returns nothing
-            mock_stdout = MagicMock()
-
-            async def mock_stdout_read(size: int) -> bytes:
-                return b""
-
-            mock_stdout.read = mock_stdout_read
-
-            # Stderr returns error message
-            mock_stderr = MagicMock()
-            stderr_read_count = 0
-
-            async def mock_stderr_read(size: int) -> bytes:
-                nonlocal stderr_read_count
-                if stderr_read_count == 0:
-                    stderr_read_count += 1
-                    return b"Error message\n"
-                return b""
-
-            mock_stderr.read = mock_stderr_read
-
-            mock_proc.stdout = mock_stdout
-            mock_proc.stderr = mock_stderr
-
-            async def mock_wait() -> int:
-                mock_proc.returncode = 0
-                return 0
-
-            mock_proc.wait = mock_wait
-
-            async def create_proc(*args, **kwargs):
-                return mock_proc
-
-            mock_create_subprocess.side_effect = create_proc
-
+        proc = _make_proc(stderr_chunks=[b"Error message\n"])
+        with patch(CREATE_SUBPROCESS, return_value=proc):
             output_chunks: list[tuple[str, str]] = []
             async for chunk_type, data in execute_run(1, "error-command"):
                 output_chunks.append((chunk_type, data))
 
-            # Should have captured stderr
-            stderr_chunks = [(t, d) for t, d in output_chunks if t == "stderr"]
-            assert len(stderr_chunks) > 0
-            assert any("Error" in data for _, data in stderr_chunks)
+        # Should have captured stderr
+        stderr_chunks = [(t, d) for t, d in output_chunks if t == "stderr"]
+        assert any("Error" in data for _, data in stderr_chunks)
 
     async def test_default_timeout_is_reasonable(self) -> None:
         """DEFAULT_TIMEOUT is a reasonable value for command execution."""
@@ -806,22 +692,15 @@ class TestSendInput:
 
     async def test_send_input_to_terminated_process(self) -> None:
         """send_input returns False when process already terminated."""
-        mock_proc = MagicMock()
-        mock_proc.returncode = 0  # Already exited
-        mock_queue: asyncio.Queue[str] = asyncio.Queue()
-
-        _active_runs[1] = (mock_proc, mock_queue)
+        _register(1, _FakeProc(returncode=0))  # Already exited
 
         result = await send_input(1, "response")
         assert result is False
 
     async def test_send_input_to_active_process(self) -> None:
         """send_input queues input for active process."""
-        mock_proc = MagicMock()
-        mock_proc.returncode = None  # Still running
         input_queue: asyncio.Queue[str] = asyncio.Queue()
-
-        _active_runs[1] = (mock_proc, input_queue)
+        _register(1, _FakeProc(), input_queue)  # Still running
 
         result = await send_input(1, "my response")
         assert result is True
@@ -832,11 +711,8 @@ class TestSendInput:
 
     async def test_send_input_multiple_responses(self) -> None:
         """send_input can queue multiple responses."""
-        mock_proc = MagicMock()
-        mock_proc.returncode = None
         input_queue: asyncio.Queue[str] = asyncio.Queue()
-
-        _active_runs[1] = (mock_proc, input_queue)
+        _register(1, _FakeProc(), input_queue)
 
         await send_input(1, "first")
         await send_input(1, "second")
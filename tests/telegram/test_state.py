@@ -1,9 +1,12 @@
 """Tests for Telegram bot state store."""
 
+import asyncio
+import sqlite3
 from datetime import UTC, datetime
 from pathlib import Path
 
 import pytest
+import pytest_asyncio
 
 from weld.telegram.config import TelegramConfig, TelegramProject
 from weld.telegram.state import (
@@ -14,7 +17,7 @@ from weld.telegram.state import (
 )
 
 
-@pytest.fixture
+@pytest_asyncio.fixture
 async def state_store():
     """Create an in-memory state store for testing."""
     async with StateStore(":memory:") as store:
@@ -44,6 +47,42 @@ class TestStateStoreInit:
         finally:
             await store.close()
 
+    async def test_migrates_v1_run_indexes(self, tmp_path: Path) -> None:
+        """Opening a v1 database replaces its single-column run indexes."""
+        db_path = tmp_path / "state.db"
+        conn = sqlite3.connect(db_path)
+        conn.executescript(
+            """
+            CREATE TABLE schema_version (version INTEGER PRIMARY KEY);
+            INSERT INTO schema_version (version) VALUES (1);
+            CREATE TABLE runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                project_name TEXT NOT NULL,
+                command TEXT NOT NULL,
+                status TEXT DEFAULT 'pending',
+                started_at TEXT NOT NULL,
+                completed_at TEXT,
+                result TEXT,
+                error TEXT
+            );
+            CREATE INDEX idx_runs_user_id ON runs(user_id);
+            CREATE INDEX idx_runs_project_name ON runs(project_name);
+            """
+        )
+        conn.close()
+
+        async with StateStore(db_path) as store:
+            assert store._conn is not None
+            async with store._conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='runs'"
+            ) as cursor:
+                indexes = {row["name"] async for row in cursor}
+
+        assert {"idx_runs_user_started", "idx_runs_project_started"} <= indexes
+        assert "idx_runs_user_id" not in indexes
+        assert "idx_runs_project_name" not in indexes
+
     async def test_context_manager(self) -> None:
         """StateStore works as async context manager."""
         async with StateStore(":memory:") as store:
@@ -239,6 +278,37 @@ class TestRunCRUD:
         assert result.command == "weld plan spec.md"
         assert result.status == "running"
 
+    async def test_create_runs_returns_ids_in_order(self, state_store: StateStore) -> None:
+        """create_runs inserts all runs and returns their IDs in input order."""
+        first_id = await state_store.create_run(Run(user_id=1, project_name="p", command="c0"))
+        runs = [Run(user_id=1, project_name="p", command=f"c{i}") for i in range(1, 4)]
+
+        run_ids = await state_store.create_runs(runs)
+
+        assert run_ids == [first_id + 1, first_id + 2, first_id + 3]
+        for run_id, run in zip(run_ids, runs, strict=True):
+            result = await state_store.get_run(run_id)
+            assert result is not None
+            assert result.command == run.command
+
+    async def test_create_runs_interleaved_with_create_run(self, state_store: StateStore) -> None:
+        """create_runs returns its own rows' IDs even when another insert interleaves."""
+        runs = [Run(user_id=1, project_name="p", command=f"batch{i}") for i in range(3)]
+        single = Run(user_id=2, project_name="p", command="single")
+
+        run_ids, single_id = await asyncio.gather(
+            state_store.create_runs(runs), state_store.create_run(single)
+        )
+
+        for run_id, run in zip([*run_ids, single_id], [*runs, single], strict=True):
+            result = await state_store.get_run(run_id)
+            assert result is not None
+            assert result.command == run.command
+
+    async def test_create_runs_empty(self, state_store: StateStore) -> None:
+        """create_runs with no runs returns an empty list."""
+        assert await state_store.create_runs([]) == []
+
     async def test_get_run_not_found(self, state_store: StateStore) -> None:
         """get_run returns None when run doesn't exist."""
         result = await state_store.get_run(99999)
@@ -303,8 +373,9 @@ class TestRunCRUD:
 
     async def test_list_runs_by_user_respects_limit(self, state_store: StateStore) -> None:
         """list_runs_by_user respects limit parameter."""
-        for i in range(5):
-            await state_store.create_run(Run(user_id=1, project_name="p", command=f"cmd{i}"))
+        await state_store.create_runs(
+            [Run(user_id=1, project_name="p", command=f"cmd{i}") for i in range(5)]
+        )
 
         runs = await state_store.list_runs_by_user(1, limit=3)
         assert len(runs) == 3
@@ -339,6 +410,19 @@ class TestStateStoreErrors:
 
         assert db_path.exists()
 
+    async def test_file_based_db_uses_wal(self, tmp_path) -> None:
+        """File-based database is opened in WAL mode with synchronous=NORMAL."""
+        async with StateStore(tmp_path / "state.db") as store:
+            assert store._conn is not None
+            async with store._conn.execute("PRAGMA journal_mode") as cursor:
+                row = await cursor.fetchone()
+                assert row is not None
+                assert row[0] == "wal"
+            async with store._conn.execute("PRAGMA synchronous") as cursor:
+                row = await cursor.fetchone()
+                assert row is not None
+                assert row[0] == 1  # NORMAL
+
 
 @pytest.mark.asyncio
 @pytest.mark.unit
@@ -436,8 +520,9 @@ class TestPruneOldRuns:
     async def test_prunes_runs_exceeding_limit(self, state_store: StateStore) -> None:
         """Runs exceeding the limit per user should be deleted."""
         # Create 5 runs for user 1
-        for i in range(5):
-            await state_store.create_run(Run(user_id=1, project_name="p", command=f"cmd{i}"))
+        await state_store.create_runs(
+            [Run(user_id=1, project_name="p", command=f"cmd{i}") for i in range(5)]
+        )
 
         count = await state_store.prune_old_runs(keep_per_user=3)
 
@@ -447,12 +532,9 @@ class TestPruneOldRuns:
 
     async def test_keeps_most_recent_runs(self, state_store: StateStore) -> None:
         """The most recent runs (by ID) should be kept."""
-        run_ids = []
-        for i in range(5):
-            run_id = await state_store.create_run(
-                Run(user_id=1, project_name="p", command=f"cmd{i}")
-            )
-            run_ids.append(run_id)
+        run_ids = await state_store.create_runs(
+            [Run(user_id=1, project_name="p", command=f"cmd{i}") for i in range(5)]
+        )
 
         await state_store.prune_old_runs(keep_per_user=3)
 
@@ -464,10 +546,12 @@ class TestPruneOldRuns:
     async def test_prunes_per_user_independently(self, state_store: StateStore) -> None:
         """Each user's runs should be pruned independently."""
         # Create 4 runs for user 1 and 3 runs for user 2
-        for i in range(4):
-            await state_store.create_run(Run(user_id=1, project_name="p", command=f"u1cmd{i}"))
-        for i in range(3):
-            await state_store.create_run(Run(user_id=2, project_name="p", command=f"u2cmd{i}"))
+        await state_store.create_runs(
+            [Run(user_id=1, project_name="p", command=f"u1cmd{i}") for i in range(4)]
+        )
+        await state_store.create_runs(
+            [Run(user_id=2, project_name="p", command=f"u2cmd{i}") for i in range(3)]
+        )
 
         count = await state_store.prune_old_runs(keep_per_user=2)
 
@@ -482,8 +566,9 @@ class TestPruneOldRuns:
 
     async def test_no_pruning_under_limit(self, state_store: StateStore) -> None:
         """No runs deleted if under the limit."""
-        for i in range(3):
-            await state_store.create_run(Run(user_id=1, project_name="p", command=f"cmd{i}"))
+        await state_store.create_runs(
+            [Run(user_id=1, project_name="p", command=f"cmd{i}") for i in range(3)]
+        )
 
         count = await state_store.prune_old_runs(keep_per_user=5)
 
@@ -499,8 +584,9 @@ class TestPruneOldRuns:
     async def test_default_keep_per_user_is_100(self, state_store: StateStore) -> None:
         """Default keep_per_user should be 100."""
         # Create 5 runs (well under 100)
-        for i in range(5):
-            await state_store.create_run(Run(user_id=1, project_name="p", command=f"cmd{i}"))
+        await state_store.create_runs(
+            [Run(user_id=1, project_name="p", command=f"cmd{i}") for i in range(5)]
+        )
 
         count = await state_store.prune_old_runs()  # Uses default
 